@@ -4,7 +4,7 @@ import logging
 import typing
 
 from ..admin.action.base import RenderHint
-from ..core.naming import AlreadyBoundException, initial_naming_context, NamingContext, NameNotFoundException
+from ..core.naming import AlreadyBoundException, CompactNamingContext, initial_naming_context, NamingContext, NameNotFoundException
 from ..core.serializable import DataclassSerializable
 
 LOGGER = logging.getLogger(__name__)
@@ -32,7 +32,8 @@ class AdminRoute(object):
     """
 
     _admin_counter = itertools.count()
-    _admin_routes = initial_naming_context.bind_new_context('admin')
+    _admin_routes = CompactNamingContext()
+    initial_naming_context.bind_context('admin', _admin_routes)
 
     @classmethod
     def _register_admin_route(cls, admin) -> Route:
@@ -25,6 +25,8 @@ class Icon(DataclassSerializable):
     The color of the icon.
     """
 
+    orjson_passthrough = True
+
     name: str
     pixmap_size: int = 32
     color: str = '#009999'
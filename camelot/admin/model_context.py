@@ -2,6 +2,120 @@ from ..core.cache import ValueCache
 from .action.application_action import ApplicationActionModelContext
 
 
+class ReadAhead(object):
+    """
+    Read ahead policy for the rows of an :class:`ObjectsModelContext`.
+
+    The objects of the rows requested by the view are fetched from the proxy
+    together with the rows before and after them, so the next requests while
+    scrolling can be served without accessing the proxy.  The number of rows
+    fetched ahead in the scroll direction grows with the scroll velocity, the
+    number of rows between the first rows of two consecutive requests.
+
+    The prefetched objects are only served as long as the proxy, its length and
+    the number of rows of the view remain the same.  Otherwise the rows are
+    fetched again, so a filter, removal or addition on the proxy never results
+    in stale objects.  Operations that reorder the proxy without changing its
+    length, such as a sort, should be followed by a call to :meth:`clear`, as
+    is done by the :class:`camelot.view.action_steps.item_view.RefreshItemView`
+    action step.
+
+    .. attribute:: metrics
+
+        A dictionary with the number of requests and requested rows, the number
+        of rows served from the prefetched window, the number of fetches
+        and fetched rows from the proxy, and the number of times the prefetched
+        window was invalidated by changes to the proxy.
+    """
+
+    def __init__(self, min_rows=10, max_rows=500, velocity_factor=2):
+        """
+        :param min_rows: the number of rows fetched before and after the
+            requested rows when not scrolling
+        :param max_rows: the maximum number of rows fetched ahead
+        :param velocity_factor: the number of rows fetched ahead per row
+            scrolled since the previous request
+        """
+        self.min_rows = min_rows
+        self.max_rows = max_rows
+        self.velocity_factor = velocity_factor
+        self.first_row = 0
+        self.objects = []
+        self.proxy = None
+        self.proxy_length = None
+        self.row_count = None
+        self.previous_row = None
+        self.metrics = {
+            'requests': 0, 'rows': 0, 'prefetched_rows': 0, 'fetches': 0, 'fetched_rows': 0, 'invalidations': 0
+        }
+
+    def clear(self):
+        """Drop the prefetched objects, when the rows of the proxy changed"""
+        self.objects = []
+        self.proxy = None
+        self.proxy_length = None
+        self.row_count = None
+        self.previous_row = None
+
+    @property
+    def prefetch_ratio(self):
+        """The fraction of the requested rows served from the prefetched window"""
+        rows = self.metrics['rows']
+        return self.metrics['prefetched_rows'] / rows if rows else 0.0
+
+    def window(self, first_row, last_row, row_count):
+        """
+        :return: a tuple with the first and the last row to fetch, when the rows
+            from first_row to last_row are requested
+        """
+        velocity = 0 if self.previous_row is None else first_row - self.previous_row
+        self.previous_row = first_row
+        ahead = min(self.max_rows, self.min_rows + self.velocity_factor * abs(velocity))
+        behind = self.min_rows
+        if velocity < 0:
+            ahead, behind = behind, ahead
+        return max(0, first_row - behind), max(last_row, min(row_count - 1, last_row + ahead))
+
+    def get_rows(self, proxy, first_row, last_row, row_count):
+        """
+        :param proxy: the :class:`camelot.core.item_model.AbstractModelProxy`
+            from which to fetch the objects
+        :param first_row: the first requested row
+        :param last_row: the last requested row, inclusive
+        :param row_count: the number of rows in the proxy
+
+        :return: a generator of tuples with the row and the object in the row
+        """
+        self.metrics['requests'] += 1
+        self.metrics['rows'] += last_row - first_row + 1
+        window_first, window_last = self.window(first_row, last_row, row_count)
+        if first_row < self.first_row or last_row >= self.first_row + len(self.objects) or \
+           not self._is_valid(proxy, row_count):
+            size = window_last - window_first + 1
+            self.objects = list(proxy.__getitem__(slice(window_first, window_last + 1), yield_per=size))
+            self.first_row = window_first
+            self.proxy = proxy
+            self.proxy_length = len(proxy)
+            self.row_count = row_count
+            self.metrics['fetches'] += 1
+            self.metrics['fetched_rows'] += len(self.objects)
+        else:
+            self.metrics['prefetched_rows'] += last_row - first_row + 1
+        # the proxy might yield less objects than requested
+        for row in range(first_row, min(last_row + 1, self.first_row + len(self.objects))):
+            yield row, self.objects[row - self.first_row]
+
+    def _is_valid(self, proxy, row_count):
+        """
+        :return: True if the prefetched objects can still be served, without
+            looking up the objects in the proxy.
+        """
+        if proxy is self.proxy and row_count == self.row_count and len(proxy) == self.proxy_length:
+            return True
+        self.metrics['invalidations'] += 1
+        return False
+
+
 class ObjectsModelContext(ApplicationActionModelContext):
     """On top of the attributes of the 
     :class:`camelot.admin.action.application_action.ApplicationActionModelContext`, 
@@ -47,6 +161,11 @@ class ObjectsModelContext(ApplicationActionModelContext):
         the attributes of Person.addresses if the list is the list of addresses
         of the Person.
 
+    .. attribute:: read_ahead
+
+        The :class:`ReadAhead` policy used by :meth:`get_rows` to prefetch the
+        objects around the requested rows.
+
     .. attribute:: collection
 
         In case of a one-2-many collection, the relationship attribute of the object that
@@ -64,6 +183,7 @@ class ObjectsModelContext(ApplicationActionModelContext):
         self.proxy = proxy
         self.locale = locale
         self.item_cache = ValueCache(100)
+        self.read_ahead = ReadAhead()
         self.static_field_attributes = []
         self.current_row = None
         self.current_column = None
@@ -109,4 +229,17 @@ class ObjectsModelContext(ApplicationActionModelContext):
             row = self.current_row
         if row != None:
             for obj in self.proxy[row:row+1]:
-                return obj
\ No newline at end of file
+                return obj
+
+    def get_rows(self, first_row, last_row):
+        """
+        :param first_row: the first row requested by the view
+        :param last_row: the last row requested by the view, inclusive
+        :return: a generator of tuples with the row and the object in the row,
+            served from the objects prefetched by the :attr:`read_ahead` policy.
+
+        This is the method through which the row data requested by the view should
+        be read, it remains consistent with the proxy when the proxy is replaced or
+        its length changes, and after the :attr:`read_ahead` policy was cleared.
+        """
+        return self.read_ahead.get_rows(self.proxy, first_row, last_row, self.collection_count)
@@ -1,8 +1,8 @@
 import logging
-import orjson
 
 from camelot.core.qt import QtCore
 from ..view.requests import AbstractRequest
+from .serializable import json_codec
 from .singleton import QSingleton
 
 LOGGER = logging.getLogger(__name__)
@@ -31,9 +31,9 @@ def get_window():
         assert _window
     return _window
 
-def cpp_action_step(gui_context_name, name, step=QtCore.QByteArray()):
+def cpp_action_step(gui_context_name, name, step=QtCore.QByteArray(), codec=json_codec):
     response = get_root_backend().action_step(gui_context_name, name, step)
-    return orjson.loads(response.data())
+    return codec.decode(response.data())
 
 
 class PythonConnection(QtCore.QObject, metaclass=QSingleton):
@@ -42,10 +42,16 @@ class PythonConnection(QtCore.QObject, metaclass=QSingleton):
     and the dgc.  As any instance of this class listens to requests for the
     server, only one instance of this class should exist, to avoid sending
     multiple responses for the same request to the client.
+
+    .. attribute:: codec
+
+        The `camelot.core.serializable.AbstractCodec` used to decode requests and
+        encode responses, as negotiated with the client.
     """
 
     def __init__(self):
         super().__init__()
+        self.codec = json_codec
         backend = get_root_backend()
         dgc = backend.distributed_garbage_collector()
         dgc.request.connect(self.on_request)
@@ -57,7 +63,8 @@ class PythonConnection(QtCore.QObject, metaclass=QSingleton):
     def _execute_serialized_request(cls, serialized_request, response_handler):
         try:
             AbstractRequest.handle_request(
-                serialized_request, response_handler, response_handler
+                serialized_request, response_handler, response_handler,
+                codec=getattr(response_handler, 'codec', json_codec),
             )
         except Exception as e:
             LOGGER.error('Unhandled exception in model process', exc_info=e)
@@ -73,15 +80,21 @@ class PythonConnection(QtCore.QObject, metaclass=QSingleton):
     def on_request(self, request):
         self._execute_serialized_request(request.data(), self)
 
-    @classmethod
-    def send_response(cls, response):
+    def set_codec(self, codec):
+        LOGGER.info('Switching to the {} codec'.format(codec.name))
+        self.codec = codec
+
+    def send_response(self, response):
         backend = get_root_backend()
         action_runner = backend.action_runner()
-        action_runner.onResponse(QtCore.QByteArray(response._to_bytes()))
+        action_runner.onResponse(QtCore.QByteArray(response.to_buffer(self.codec)))
 
     @classmethod
     def send_action_step(cls, gui_context_name, step):
-        return cpp_action_step(gui_context_name, type(step).__name__, step._to_bytes())
+        # the codec negotiated by the client is kept by the connection instance
+        connection = cls._instances.get(cls)
+        codec = getattr(connection, 'codec', json_codec)
+        return cpp_action_step(gui_context_name, type(step).__name__, step.to_buffer(codec), codec)
 
     def has_cancel_request(self):
         return False
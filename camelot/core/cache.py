@@ -27,7 +27,17 @@
 #
 #  ============================================================================
 
+from array import array
 import collections
+import sys
+
+
+def value_size(values):
+    """
+    Estimate the number of bytes used by the values of a row, without
+    following the references of the values.
+    """
+    return sum(sys.getsizeof(value) for value in values.values())
 
 
 class ValueCache(object):
@@ -37,34 +47,65 @@ class ValueCache(object):
     This cache is used to track which values have changed and for which
     an update of the gui is needed.
 
-    Fifo, is the actual cache containing a limited set of copies of row data
-    so the data in Fifo, is always immediately accessible to the gui thread,
-    with zero delay as you scroll down the table view, Fifo is filled and
-    refilled with data queried from the database
-    
+    The cache contains a limited set of copies of row data so the data is
+    always immediately accessible to the gui thread, with zero delay as you
+    scroll down the table view.  The cache is filled and refilled with data
+    queried from the database.  When the cache is full, the least recently
+    used row is removed, a row is used when its data is added or requested.
+
     the cache can be queried either by the row number or by object represented 
     by the row data.
+
+    .. attribute:: metrics
+
+        A dictionary with the number of cache hits and misses of :meth:`get_data`,
+        the number of rows evicted, and the number of columns added and changed
+        by :meth:`add_data`.
     """
-    def __init__(self, max_entries):
+
+    def __init__(self, max_entries, max_size=None, size_of=value_size):
         """:param max_entries: the maximum entries that will be stored in the
-        cache, if more data is added, the oldest data gets removed"""
+        cache, if more data is added, the least recently used data gets removed
+        :param max_size: the maximum number of bytes the values in the cache
+        might use, `None` if the cache should only be bounded by max_entries
+        :param size_of: a function estimating the number of bytes used by the
+        values of a row, only used when a max_size is given
+        """
         self.max_entries = max_entries
-        self.data_by_rows = collections.defaultdict(dict)
+        self.max_size = max_size
+        self.size_of = size_of
+        self.size = 0
+        self.data_by_rows = dict()
+        self.entities_by_row = dict()
+        self.sizes_by_row = dict()
+        # the order of the entities is the order in which they were used
         self.rows_by_entity = collections.OrderedDict()
-    
+        self.metrics = {'hits': 0, 'misses': 0, 'evictions': 0, 'columns': 0, 'changed_columns': 0}
+
     def __repr__(self):
-        return u'ValueCache({0.max_entries})'.format(self)
+        return u'ValueCache({0.max_entries}, {0.max_size})'.format(self)
     
     def __len__(self):
         """The number of rows in the cache"""
         return len(self.rows_by_entity)
-    
+
+    @property
+    def hit_ratio(self):
+        requests = self.metrics['hits'] + self.metrics['misses']
+        return self.metrics['hits'] / requests if requests else 0.0
+
+    @property
+    def changed_column_ratio(self):
+        """The fraction of the columns passed to :meth:`add_data` that had changed"""
+        columns = self.metrics['columns']
+        return self.metrics['changed_columns'] / columns if columns else 0.0
+
     def rows(self):
         """
-        :return: a interator of the row numbers for which this fifo
-        had data
+        :return: a interator of the row numbers for which this cache
+        has data
         """
-        return self.data_by_rows.keys()
+        return self.entities_by_row.keys()
 
     def add_data(self, row, entity, values):
         """The entity might already be on another row, and this row
@@ -73,40 +114,363 @@ class ValueCache(object):
         :return: a :class:`set` with all the changed columns in the row
         
         """
-        old_value = self.delete_by_entity(entity)[1]
-        if old_value is None:
+        old_row = self.rows_by_entity.get(entity)
+        if old_row is None:
             # there was no old data, so everything has changed
             changed_columns = set(values.keys())
             new_values = values
         else:
+            old_value = self.data_by_rows[old_row]
             changed_columns = set(col for col, value in values.items() if value != old_value.get(col))
             new_values = old_value
             new_values.update(values)
-        self.data_by_rows[row] = new_values
-        self.rows_by_entity[entity] = row
-        if len(self.rows_by_entity)>self.max_entries:
-            entity, _row = self.rows_by_entity.popitem(last=False)
-            self.delete_by_entity(entity)
+            if old_row != row:
+                self._move(entity, old_row, row)
+        if old_row != row:
+            # the row might contain another entity
+            other_entity = self.entities_by_row.get(row)
+            if other_entity is not None:
+                self.delete_by_entity(other_entity)
+            self.data_by_rows[row] = new_values
+            self.entities_by_row[row] = entity
+            self.rows_by_entity[entity] = row
+        self.rows_by_entity.move_to_end(entity)
+        if self.max_size is not None:
+            size = self.size_of(new_values)
+            self.size += size - self.sizes_by_row.get(row, 0)
+            self.sizes_by_row[row] = size
+        self.metrics['columns'] += len(values)
+        self.metrics['changed_columns'] += len(changed_columns)
+        self._evict()
         return changed_columns
 
+    def _move(self, entity, old_row, row):
+        self.data_by_rows[row] = self.data_by_rows.pop(old_row)
+        del self.entities_by_row[old_row]
+        size = self.sizes_by_row.pop(old_row, None)
+        if size is not None:
+            self.size -= size
+
+    def _evict(self):
+        """Remove the least recently used rows until the cache is within its bounds"""
+        max_size = self.max_size
+        while len(self.rows_by_entity) > self.max_entries or (
+            max_size is not None and self.size > max_size and len(self.rows_by_entity) > 1):
+            entity = next(iter(self.rows_by_entity))
+            self.delete_by_entity(entity)
+            self.metrics['evictions'] += 1
+
     def get_data(self, row):
         """
         The return value of this function should not be changed.
 
         :return: a `dict` with the cached data in a row, the keys are the columns
         """
-        return self.data_by_rows.get(row, {})
+        entity = self.entities_by_row.get(row)
+        if entity is None:
+            self.metrics['misses'] += 1
+            return {}
+        self.metrics['hits'] += 1
+        self.rows_by_entity.move_to_end(entity)
+        return self.data_by_rows[row]
 
     def delete_by_entity(self, entity):
         """Remove everything in the cache related to an entity instance
         returns the row at which the data was stored if the data was in the
         cache, return None otherwise"""
-        try:
-            row = self.rows_by_entity[entity]
-            value = self.data_by_rows.get(row, None)
-            del self.data_by_rows[row]
-            del self.rows_by_entity[entity]      
-        except KeyError:
+        row = self.rows_by_entity.pop(entity, None)
+        if row is None:
             return None, None
+        value = self.data_by_rows.pop(row)
+        del self.entities_by_row[row]
+        size = self.sizes_by_row.pop(row, None)
+        if size is not None:
+            self.size -= size
         return row, value
 
+
+# the typecodes of the columns that can be stored in an array, other
+# columns are stored in a list
+_typecodes = {bool: 'b', int: 'q', float: 'd'}
+_types = {typecode: value_type for value_type, typecode in _typecodes.items()}
+_NoneType = type(None)
+
+# the state of a cell in a column
+_missing, _value, _null = 0, 1, 2
+
+
+class _ColumnPage(object):
+    """The columns of a page of consecutive rows in a `ColumnarValueCache`"""
+
+    __slots__ = ('columns', 'count')
+
+    def __init__(self):
+        # column -> (values, states)
+        self.columns = dict()
+        # the number of rows in the page with an entity
+        self.count = 0
+
+
+class ColumnarValueCache(ValueCache):
+    """
+    A :class:`ValueCache` that stores the values per column instead of a dict
+    per row, for wide tables with numeric and boolean columns.
+
+    The rows are grouped in pages of `page_size` consecutive rows.  Within a
+    page, a column holding only bool, int or float values is stored in an
+    :class:`array.array`, other columns in a list.  A bytearray per column
+    keeps track of which cells hold a value, hold None or are missing.
+
+    :meth:`add_block` adds the data of consecutive rows at once, and compares
+    the new and the old values of a column for all rows in a page with a single
+    array comparison, only when they differ the changed rows are looked up.
+    Adding the rows one by one with :meth:`add_data` is slower than with a
+    :class:`ValueCache`.
+
+    The cache is bounded by max_entries only.  It is not used as the item cache
+    of a model context yet, as that pays off only once the rows are added by
+    block, by the action that serves the row data to the view.
+    """
+
+    def __init__(self, max_entries, page_size=64):
+        super().__init__(max_entries)
+        self.page_size = page_size
+        self.pages = dict()
+        # column -> typecode of the array, None if the column is stored in a list,
+        # columns that only received None values have no typecode yet
+        self.typecodes = dict()
+
+    def __repr__(self):
+        return u'ColumnarValueCache({0.max_entries}, {0.page_size})'.format(self)
+
+    def _empty_values(self, typecode):
+        if typecode is None:
+            return [None] * self.page_size
+        return array(typecode, [0]) * self.page_size
+
+    def _set_typecode(self, column, typecode):
+        """
+        Change the storage of a column in all pages, from no typecode to
+        an array typecode, or from any typecode to a list.
+        """
+        old_typecode = self.typecodes.get(column, 'b')
+        self.typecodes[column] = typecode
+        for page in self.pages.values():
+            column_data = page.columns.get(column)
+            if column_data is None:
+                continue
+            values, states = column_data
+            if typecode is None:
+                values = [self._read(old_typecode, values[i]) if states[i] == _value else None for i in range(self.page_size)]
+            else:
+                values = self._empty_values(typecode)
+            page.columns[column] = (values, states)
+
+    @staticmethod
+    def _read(typecode, value):
+        return bool(value) if typecode == 'b' else value
+
+    def _column_typecode(self, column, types):
+        """
+        :param types: the types of the values to store in the column
+        :return: the typecode of the column once it can store these types
+        """
+        types.discard(_NoneType)
+        typecode = self.typecodes.get(column, 'b')
+        if types:
+            if column not in self.typecodes:
+                typecode = _typecodes.get(types.pop()) if len(types) == 1 else None
+                self._set_typecode(column, typecode)
+            elif typecode is not None and types != {_types[typecode]}:
+                typecode = None
+                self._set_typecode(column, typecode)
+        return typecode
+
+    def _column(self, page, column):
+        column_data = page.columns.get(column)
+        if column_data is None:
+            column_data = page.columns[column] = (
+                self._empty_values(self.typecodes.get(column, 'b')), bytearray(self.page_size)
+            )
+        return column_data
+
+    def _row_data(self, row):
+        page = self.pages[row // self.page_size]
+        offset = row % self.page_size
+        data = dict()
+        for column, (values, states) in page.columns.items():
+            state = states[offset]
+            if state == _value:
+                data[column] = self._read(self.typecodes.get(column), values[offset])
+            elif state == _null:
+                data[column] = None
+        return data
+
+    def _clear_row(self, row):
+        page_number, offset = divmod(row, self.page_size)
+        page = self.pages[page_number]
+        page.count -= 1
+        if page.count == 0:
+            del self.pages[page_number]
+            return
+        for values, states in page.columns.values():
+            states[offset] = _missing
+            values[offset] = 0 if isinstance(values, array) else None
+
+    def _place(self, row, entity):
+        """Put the entity in a row, moving its data if it was on another row
+
+        :return: `True` if the entity was already in the cache
+        """
+        old_row = self.rows_by_entity.get(entity)
+        if old_row != row:
+            other_entity = self.entities_by_row.get(row)
+            if other_entity is not None:
+                self.delete_by_entity(other_entity)
+            page_number, offset = divmod(row, self.page_size)
+            page = self.pages.get(page_number)
+            if page is None:
+                page = self.pages[page_number] = _ColumnPage()
+            page.count += 1
+            if old_row is not None:
+                old_page = self.pages[old_row // self.page_size]
+                old_offset = old_row % self.page_size
+                for column, (old_values, old_states) in old_page.columns.items():
+                    values, states = self._column(page, column)
+                    values[offset] = old_values[old_offset]
+                    states[offset] = old_states[old_offset]
+                del self.entities_by_row[old_row]
+                self._clear_row(old_row)
+            self.entities_by_row[row] = entity
+            self.rows_by_entity[entity] = row
+        self.rows_by_entity.move_to_end(entity)
+        return old_row is not None
+
+    def add_data(self, row, entity, values):
+        """The entity might already be on another row, and this row
+        might already contain an entity
+
+        :return: a :class:`set` with all the changed columns in the row
+        """
+        existing = self._place(row, entity)
+        page_number, offset = divmod(row, self.page_size)
+        changed_columns = set()
+        for column, value in values.items():
+            typecode = self._column_typecode(column, {type(value)})
+            column_values, states = self._column(self.pages[page_number], column)
+            old_state, old_value = states[offset], column_values[offset]
+            if value is None:
+                state = _null
+                if old_state == _value or (old_state == _missing and not existing):
+                    changed_columns.add(column)
+                column_values[offset] = None if typecode is None else 0
+            else:
+                state = _value
+                if old_state != _value or old_value != value:
+                    changed_columns.add(column)
+                try:
+                    column_values[offset] = value
+                except OverflowError:
+                    self._set_typecode(column, None)
+                    column_values, states = self._column(self.pages[page_number], column)
+                    column_values[offset] = value
+            states[offset] = state
+        self.metrics['columns'] += len(values)
+        self.metrics['changed_columns'] += len(changed_columns)
+        self._evict()
+        return changed_columns
+
+    def add_block(self, first_row, entities, columns):
+        """
+        Add the data of consecutive rows.
+
+        :param first_row: the row of the first entity
+        :param entities: the distinct entities in the rows starting at first_row
+        :param columns: a `dict` with for each column a sequence with the
+            values of the entities
+        :return: a list with for each entity a :class:`set` with the changed
+            columns in its row, the same as when adding the rows one by one
+            to a :class:`ValueCache`, even when rows are evicted while doing so
+        """
+        existing = []
+        for position, entity in enumerate(entities):
+            existing.append(self._place(first_row + position, entity))
+            # Evict the rows as if the entities were added one by one, so entities of
+            # the block that are evicted before their turn are added as new entities.
+            # The rows placed so far are only evicted once their values are added.
+            while len(self.rows_by_entity) > max(self.max_entries, position + 1):
+                self.delete_by_entity(next(iter(self.rows_by_entity)))
+                self.metrics['evictions'] += 1
+        changed = [set() for _entity in entities]
+        page_size = self.page_size
+        for column, column_values in columns.items():
+            types = set(map(type, column_values))
+            column_nulls = _NoneType in types
+            typecode = self._column_typecode(column, types)
+            position = 0
+            while position < len(entities):
+                page_number, offset = divmod(first_row + position, page_size)
+                length = min(len(entities) - position, page_size - offset)
+                block = column_values[position:position + length]
+                nulls = column_nulls and (None in block)
+                if nulls:
+                    new_states = bytearray(_value if value is not None else _null for value in block)
+                else:
+                    new_states = bytearray((_value,)) * length
+                try:
+                    if typecode is None:
+                        new_values = list(block)
+                    elif not nulls:
+                        new_values = array(typecode, block)
+                    else:
+                        new_values = array(typecode, (0 if value is None else value for value in block))
+                except OverflowError:
+                    # an int too large for an array
+                    typecode = None
+                    self._set_typecode(column, typecode)
+                    new_values = list(block)
+                values, states = self._column(self.pages[page_number], column)
+                old_states = states[offset:offset + length]
+                old_values = values[offset:offset + length]
+                if old_states != new_states or old_values != new_values:
+                    for i in range(length):
+                        if old_states[i] != new_states[i]:
+                            # like in a ValueCache, a None value of an entity without
+                            # a value for the column is not a change
+                            if old_states[i] == _missing and new_states[i] == _null and existing[position + i]:
+                                continue
+                            changed[position + i].add(column)
+                        elif old_values[i] != new_values[i]:
+                            changed[position + i].add(column)
+                # equal values in a list might be of a different type
+                values[offset:offset + length] = new_values
+                states[offset:offset + length] = new_states
+                position += length
+        self.metrics['columns'] += len(columns) * len(entities)
+        self.metrics['changed_columns'] += sum(len(changed_columns) for changed_columns in changed)
+        self._evict()
+        return changed
+
+    def get_data(self, row):
+        """
+        :return: a `dict` with the cached data in a row, the keys are the columns
+        """
+        entity = self.entities_by_row.get(row)
+        if entity is None:
+            self.metrics['misses'] += 1
+            return {}
+        self.metrics['hits'] += 1
+        self.rows_by_entity.move_to_end(entity)
+        return self._row_data(row)
+
+    def delete_by_entity(self, entity):
+        """Remove everything in the cache related to an entity instance
+        returns the row at which the data was stored if the data was in the
+        cache, return None otherwise"""
+        row = self.rows_by_entity.pop(entity, None)
+        if row is None:
+            return None, None
+        value = self._row_data(row)
+        del self.entities_by_row[row]
+        self._clear_row(row)
+        return row, value
@@ -4,11 +4,17 @@ Inspired by the Corba/Java NamingContext.
 """
 from __future__ import annotations
 
+import bisect
 import collections
+import contextlib
 import datetime
 import decimal
 import functools
+import itertools
 import logging
+import sys
+import threading
+import time
 import typing
 import weakref
 
@@ -18,7 +24,7 @@ from camelot.core.qt import QtGui
 from camelot.core.utils import Arity
 
 from decimal import Decimal
-from sqlalchemy import inspect, orm
+from sqlalchemy import inspect, orm, tuple_
 
 from .singleton import Singleton
 
@@ -29,6 +35,21 @@ CompositeName = typing.Tuple[str, ...]
 # Unified name that can be either an atomic name or a composite name.
 Name = typing.Union[str, CompositeName]
 
+class ValidatedName(tuple):
+    """
+    Composite name of which all atomic parts have been validated by the naming contexts along its path,
+    such as the fully qualified names returned when binding objects.
+    Naming contexts recognise validated names and do not validate them again.
+    """
+
+    __slots__ = ()
+
+def _tail(name: CompositeName) -> CompositeName:
+    # The remaining parts of a composite name for the recursive resolve, which stay validated if the name was.
+    if type(name) is ValidatedName:
+        return ValidatedName(name[1:])
+    return name[1:]
+
 class BindingType(Enum):
 
     named_object = 1
@@ -66,6 +87,7 @@ class NamingException(Exception):
         invalid_composite_name_parts = 'composite name should be composed of valid atomic parts'
         singular_name_expected = 'only atomic or singular composite names are supported by this endpoint naming context'
         invalid_composite_name_length = 'composite name should be composed of {length} atomic parts'
+        invalid_cursor = 'cursor should be a name below the listed prefix'
 
 class UnboundException(NamingException):
     """A NamingException that is thrown when a NamingContext bound to another NamingContext yet."""
@@ -122,10 +144,17 @@ class AbstractNamingContext(object):
     ----------
     All the methods in this interface can throw a NamingException or any of its subclasses.
     See NamingException and their subclasses for details on each exception.
+
+    Threads
+    -------
+    Contexts can be used from multiple threads.  Resolving names does not acquire any lock, while
+    adding and removing bindings is serialized per context, so concurrent binds in different
+    subcontexts do not contend with each other.
     """
 
     def __init__(self):
         self._name = None
+        self._index = None
 
     def validate_atomic_name(self, name: str):
         """
@@ -155,11 +184,13 @@ class AbstractNamingContext(object):
             NamingException NamingException.Message.multiary_name_expected when the given composite name has no composed atomic parts.
             NamingException NamingException.Message.invalid_composite_name_parts when the given composite name is not composed of valid atomic parts.
         """
+        if type(name) is ValidatedName:
+            return
         if not isinstance(name, tuple):
             raise NamingException(NamingException.Message.invalid_name, reason=NamingException.Message.invalid_composite_name)
         elif len(name) == 0:
             raise NamingException(NamingException.Message.invalid_name, reason=NamingException.Message.multiary_name_expected)
-        elif not all([isinstance(name_part, str) for name_part in name]):
+        elif not all(isinstance(name_part, str) for name_part in name):
             raise NamingException(NamingException.Message.invalid_name, reason=NamingException.Message.invalid_composite_name_parts)
 
     def get_composite_name(self, name: Name) -> CompositeName:
@@ -177,6 +208,8 @@ class AbstractNamingContext(object):
         :raises:
             NamingException NamingException.Message.invalid_name: The supplied name or one of its composed part is invalid for this context.
         """
+        if type(name) is ValidatedName:
+            return name
         if isinstance(name, str):
             self.validate_atomic_name(name)
             composite_name = tuple([name])
@@ -315,12 +348,183 @@ class AbstractNamingContext(object):
         """
         raise NotImplementedError
 
+    def resolve_many(self, names: typing.Iterable[Name]) -> typing.List[object]:
+        """
+        Retrieve the objects bound to multiple names in the context at once.
+        Resolving a name that fails does not interrupt the resolution of the others;
+        instead of the bound object, the raised NamingException is put in its place in the result.
+
+        This default implementation resolves each name separately, subclasses may
+        reimplement it to resolve the names in bulk.
+
+        :param names: an iterable of names, atomic or composite, and relative to this naming context.
+
+        :return: a list with for each of the given names, in the same order, either the bound object
+            or the NamingException that was raised while resolving it.
+        """
+        results = []
+        for name in names:
+            try:
+                results.append(self.resolve(name))
+            except NamingException as e:
+                results.append(e)
+        return results
+
+    def unbind_many(self, names: typing.Iterable[Name]) -> typing.List[typing.Optional[NamingException]]:
+        """
+        Remove multiple object bindings from the context at once.
+        Failing to remove a binding does not interrupt the removal of the others.
+
+        This default implementation unbinds each name separately, subclasses may
+        reimplement it to remove the bindings in bulk.
+
+        :param names: an iterable of names, atomic or composite, and relative to this naming context.
+
+        :return: a list with for each of the given names, in the same order, either None if the binding
+            was removed, or the NamingException that was raised while removing it.
+        """
+        results = []
+        for name in names:
+            try:
+                self.unbind(name)
+                results.append(None)
+            except NamingException as e:
+                results.append(e)
+        return results
+
     def list(self):
         """
         Returns the set of bindings in the naming context.
         """
         raise NotImplementedError
 
+    def _list_keys(self) -> typing.List[typing.Tuple[str, int]]:
+        """
+        Return the keys of the bindings of this context itself, as `(atomic_name, binding_type.value)` tuples,
+        sorted on their atomic name and binding type.  This default implementation has no bindings to list.
+        """
+        return []
+
+    def _get_entry(self, atomic_name: str, binding_type: BindingType) -> object:
+        """
+        Return the object bound in this context itself under the atomic name with the binding type.
+
+        :raises:
+            NameNotFoundException NamingException.Message.name_not_found: if no binding was found for the given name.
+        """
+        raise NameNotFoundException(atomic_name, binding_type)
+
+    def iter_names(self, prefix: Name = None, binding_type: BindingType = None, cursor=None):
+        """
+        Iterate over the names of the bindings in this context and its subcontexts, without recursion.
+        The names are yielded in a stable order : sorted on their atomic parts, with the bindings of a
+        context following the context itself.  Each context keeps the sorted keys of its bindings until
+        they change, so resuming after a cursor only needs a binary search per level of the cursor.
+
+        :param prefix: the name of the subcontext, relative to this context, of which the bindings should be listed.
+        :param binding_type: a member of `camelot.core.naming.BindingType` to list only the bindings of that type,
+            or None to list the bindings of both types.
+        :param cursor: an item yielded by a previous iteration, to resume the iteration after that item.
+
+        :return: a generator of `(name, binding_type)` tuples, with the name relative to this context.
+
+        :raises:
+            NamingException NamingException.Message.invalid_name: when the prefix or the cursor is invalid.
+            NameNotFoundException NamingException.Message.name_not_found: if no context is bound under the prefix.
+        """
+        prefix = tuple() if prefix in (None, tuple()) else self.get_composite_name(prefix)
+        context = self.resolve_context(prefix) if len(prefix) else self
+        # The keys after which to resume, one per level of the cursor.
+        resume_after = None
+        if cursor is not None:
+            cursor_name, cursor_type = cursor
+            cursor_name = tuple(cursor_name)
+            if cursor_name[:len(prefix)] != prefix or len(cursor_name) <= len(prefix):
+                raise NamingException(NamingException.Message.invalid_name, reason=NamingException.Message.invalid_cursor)
+            parts = cursor_name[len(prefix):]
+            resume_after = [(part, BindingType.named_context.value) for part in parts[:-1]]
+            resume_after.append((parts[-1], cursor_type.value))
+        # Stack of the path, the context, its sorted keys and the position of the next key to list, per level.
+        stack = []
+        path = prefix
+        while True:
+            keys = context._list_keys()
+            position = 0
+            if resume_after is not None:
+                position = bisect.bisect_left(keys, resume_after[0])
+                if position < len(keys) and keys[position] == resume_after[0]:
+                    position += 1
+                    atomic_name, type_value = resume_after[0]
+                    if type_value == BindingType.named_context.value:
+                        # The cursor points to this context or to a binding below it, continue in the context
+                        try:
+                            subcontext = context._get_entry(atomic_name, BindingType.named_context)
+                        except NameNotFoundException:
+                            pass
+                        else:
+                            stack.append((path, context, keys, position))
+                            path, context, resume_after = (*path, atomic_name), subcontext, (resume_after[1:] or None)
+                            continue
+            stack.append((path, context, keys, position))
+            break
+        while len(stack):
+            path, context, keys, position = stack[-1]
+            if position >= len(keys):
+                stack.pop()
+                continue
+            stack[-1] = (path, context, keys, position + 1)
+            atomic_name, type_value = keys[position]
+            entry_type = BindingType(type_value)
+            try:
+                obj = context._get_entry(atomic_name, entry_type)
+            except NameNotFoundException:
+                # The binding was removed since the keys were sorted
+                continue
+            name = (*path, atomic_name)
+            if binding_type in (None, entry_type):
+                yield (name, entry_type)
+            if entry_type == BindingType.named_context:
+                stack.append((name, obj, obj._list_keys(), 0))
+
+    def list_page(self, prefix: Name = None, binding_type: BindingType = None, cursor=None, page_size=1000):
+        """
+        List a page of the names of the bindings in this context and its subcontexts.
+
+        :see: camelot.core.naming.AbstractNamingContext.iter_names
+
+        :param page_size: the maximum number of names on the page.
+
+        :return: a tuple with a list of `(name, binding_type)` tuples, and the cursor to pass for the next
+            page, which is None when there are no more names.
+        """
+        assert page_size > 0
+        page = list(itertools.islice(self.iter_names(prefix, binding_type, cursor), page_size + 1))
+        if len(page) > page_size:
+            page = page[:page_size]
+            return page, page[-1]
+        return page, None
+
+    def stats(self) -> dict:
+        """
+        Report statistics on the bindings in this context and its subcontexts.
+        Contexts that do not store any physical bindings report no bindings.
+
+        :return: a dictionary with :
+            * bindings: the number of named object bindings in this context.
+            * total_bindings: the number of named object bindings in this context and all of its subcontexts.
+            * size: the approximate size in bytes of the objects bound in this context and all of its subcontexts.
+            * oldest_binding_age: the age in seconds of the oldest named object binding in this context
+              and all of its subcontexts, or None if there are no bindings.
+            * subcontexts: a dictionary mapping the atomic names of the subcontexts to their statistics.
+        """
+        return {
+            'bindings': 0,
+            'total_bindings': 0,
+            'size': 0,
+            'oldest_binding_age': None,
+            'subcontexts': {},
+        }
+
     def __contains__(self, name: Name):
         try:
             self.resolve(name)
@@ -328,20 +532,43 @@ class AbstractNamingContext(object):
         except (NameNotFoundException, KeyError):
             return False
 
+    def _attach_index(self, index):
+        """
+        Register this context in the path index of the initial naming context it got bound to.
+        Contexts without bindings of their own only need to keep a reference to the index.
+        """
+        self._index = index
+
+    def _detach_index(self):
+        """
+        Remove this context and all of its bindings from the path index it was registered in.
+        """
+        self._index = None
+
     @classmethod
     def verbose_name(cls, route):
         return '/'.join(route)
 
     @check_bounded
     def dump_names(self):
-        for name in self.list():
-            LOGGER.info(self.verbose_name(*self._name, name))
+        for name, _binding_type in self.iter_names(binding_type=BindingType.named_object):
+            LOGGER.info(self.verbose_name((*self._name, *name)))
 
 class AbstractBindingStorage(object):
     """
     Abstract interface for name-to-object binding storage.
+
+    .. attribute:: indexable
+
+        flag that indicates whether the bindings in this storage may be registered in the path index
+        of the initial naming context.  Storages that can drop bindings without them being explicitly
+        removed should not be indexable, as the index would keep those bindings alive.
     """
 
+    __slots__ = ()
+
+    indexable = True
+
     def add(self, name, obj, immutable=False):
         """
         Store a binding for the given name and object with the given mutability.
@@ -389,6 +616,13 @@ class AbstractBindingStorage(object):
     def list(self):
         raise NotImplementedError
 
+    def oldest_timestamp(self):
+        """
+        :return: the `time.monotonic` timestamp at which the oldest binding in this storage was added,
+            or None if the storage is empty or does not keep track of the age of its bindings.
+        """
+        raise NotImplementedError
+
     def __contains__(self, name):
         raise NotImplementedError
 
@@ -398,20 +632,20 @@ class AbstractBindingStorage(object):
 class BindingStorage(AbstractBindingStorage):
     """
     Default binding storage implementation that stores the bindings in a
-    name-to-object dictionary.
+    name-to-object dictionary.  It does not keep track of the age of its bindings.
     """
 
     def __init__(self, binding_type):
         self.binding_type = binding_type
         self._bindings = {}
-        self._immutable = []
+        self._immutable = set()
 
     def add(self, name, obj, immutable=False):
         if name in self._bindings and name in self._immutable:
             raise ImmutableBindingException(self.binding_type, name)
         self._bindings[name] = obj
         if immutable:
-            self._immutable.append(name)
+            self._immutable.add(name)
 
     def remove(self, name):
         if name not in self._bindings:
@@ -421,9 +655,10 @@ class BindingStorage(AbstractBindingStorage):
         return self._bindings.pop(name)
 
     def get(self, name):
-        if name not in self._bindings:
+        try:
+            return self._bindings[name]
+        except KeyError:
             raise NameNotFoundException(name, self.binding_type)
-        return self._bindings[name]
 
     def copy(self):
         duplicate = self.__class__(self.binding_type)
@@ -435,8 +670,11 @@ class BindingStorage(AbstractBindingStorage):
         """
         Return the names of the bindings as valid names (tuples)
         """
-        for key in self._bindings.keys():
-            yield (key,)
+        # Take a snapshot of the names, as bindings might be added or removed while iterating.
+        return ((key,) for key in tuple(self._bindings.keys()))
+
+    def oldest_timestamp(self):
+        return None
 
     def __contains__(self, name):
         return name in self._bindings
@@ -454,10 +692,304 @@ class WeakValueBindingStorage(BindingStorage):
     Additionally, this also means that with this storage backend, immutable bindings can get removed by the latter process.
     """
 
+    indexable = False
+
     def __init__(self, binding_type):
         super().__init__(binding_type)
         self._bindings = weakref.WeakValueDictionary()
 
+class CompactBindingStorage(AbstractBindingStorage):
+    """
+    Binding storage implementation optimized for memory usage, meant for contexts with a large number of bindings.
+    Besides the name-to-object dictionary, it keeps no data per binding : the names of the immutable bindings
+    are kept in a set, and the age of the bindings is tracked per second in which bindings were added.
+
+    The names of such contexts are mostly counters or object ids, which are stored as an int instead
+    of as their decimal string, so the string can be reclaimed once the name was sent to the client.
+
+    For each such second, the name of the first binding added in it is kept as a mark.  As the dictionary
+    is ordered by the time the names were added, the age of the oldest binding is found by looking up the
+    mark of its second.  When that mark was removed, the age of an older mark is used, so the reported
+    age is never younger than the actual age.  At most `max_marks` marks are kept, when more marks are added,
+    the second oldest marks are merged into the oldest one.
+    """
+
+    __slots__ = ('binding_type', '_bindings', '_immutable', '_marks')
+
+    max_marks = 1024
+
+    def __init__(self, binding_type):
+        self.binding_type = binding_type
+        self._bindings = {}
+        self._immutable = set()
+        # tuples of the second in which bindings were added, and the name of the first of them
+        self._marks = collections.deque()
+
+    @staticmethod
+    def _key(name):
+        """
+        :return: the key under which name is stored in the dictionary
+        """
+        if name.isdigit() and name.isascii() and (name[0] != '0' or name == '0'):
+            return int(name)
+        return name
+
+    @staticmethod
+    def _name(key):
+        return key if isinstance(key, str) else str(key)
+
+    def add(self, name, obj, immutable=False):
+        key = self._key(name)
+        if key in self._bindings:
+            if key in self._immutable:
+                raise ImmutableBindingException(self.binding_type, name)
+            # the binding is replaced in place, so it remains resolvable by other threads,
+            # and keeps the age of the name
+            self._bindings[key] = obj
+        else:
+            self._bindings[key] = obj
+            tick = int(time.monotonic())
+            marks = self._marks
+            if not len(marks) or marks[-1][0] != tick:
+                marks.append((tick, key))
+                if len(marks) > self.max_marks:
+                    oldest_mark = marks.popleft()
+                    marks.popleft()
+                    marks.appendleft(oldest_mark)
+        if immutable:
+            self._immutable.add(key)
+
+    def remove(self, name):
+        key = self._key(name)
+        if key not in self._bindings:
+            raise NameNotFoundException(name, self.binding_type)
+        if key in self._immutable:
+            raise ImmutableBindingException(self.binding_type, name)
+        return self._bindings.pop(key)
+
+    def get(self, name):
+        try:
+            return self._bindings[self._key(name)]
+        except KeyError:
+            raise NameNotFoundException(name, self.binding_type)
+
+    def copy(self):
+        duplicate = self.__class__(self.binding_type)
+        duplicate._bindings = dict(self._bindings)
+        duplicate._immutable = set(self._immutable)
+        duplicate._marks = collections.deque(self._marks)
+        return duplicate
+
+    def list(self):
+        """
+        Return the names of the bindings as valid names (tuples)
+        """
+        # Take a snapshot of the names, as bindings might be added or removed while iterating.
+        return ((self._name(key),) for key in tuple(self._bindings.keys()))
+
+    def oldest_timestamp(self):
+        oldest_name = next(iter(self._bindings), None)
+        if oldest_name is None:
+            return None
+        marks = self._marks
+        # the first mark of which the name is still bound
+        for i, (tick, name) in enumerate(marks):
+            if name in self._bindings:
+                if name == oldest_name:
+                    # no bindings remain from the seconds before this mark
+                    for _i in range(i):
+                        marks.popleft()
+                    return tick
+                break
+        return marks[0][0]
+
+    def __contains__(self, name):
+        return self._key(name) in self._bindings
+
+    def __len__(self):
+        return len(self._bindings)
+
+class ReferenceCountingBindingStorage(CompactBindingStorage):
+    """
+    Binding storage implementation that counts the number of times each binding was added.
+    Removing a binding decrements its count, and the binding is only reclaimed when its count drops to zero.
+    This allows the same object to be bound multiple times under the same name, on behalf of a client
+    that releases each of those names separately.
+
+    As the removal of a binding might leave it in place, the bindings are not indexable.
+    The number of reclaimed bindings is tracked in the `metrics` counter.
+    """
+
+    __slots__ = ('_counts', 'metrics')
+
+    indexable = False
+
+    def __init__(self, binding_type):
+        super().__init__(binding_type)
+        self._counts = {}
+        self.metrics = collections.Counter()
+
+    def add(self, name, obj, immutable=False):
+        super().add(name, obj, immutable)
+        key = self._key(name)
+        self._counts[key] = self._counts.get(key, 0) + 1
+
+    def remove(self, name):
+        key = self._key(name)
+        count = self._counts.get(key)
+        if count is None:
+            raise NameNotFoundException(name, self.binding_type)
+        if count > 1:
+            self._counts[key] = count - 1
+            return self.get(name)
+        obj = super().remove(name)
+        del self._counts[key]
+        self.metrics['reclaimed'] += 1
+        return obj
+
+    def copy(self):
+        duplicate = super().copy()
+        duplicate._counts = dict(self._counts)
+        return duplicate
+
+class ExpiringBindingStorage(BindingStorage):
+    """
+    Binding storage implementation that limits the lifetime and the number of its bindings.
+    Each binding expires after a time to live, which is reset when the binding is renewed.
+    When the maximum number of bindings is exceeded, the bindings that were added or renewed
+    the longest time ago are evicted first, and a warning is logged as those bindings might still be
+    in use.  Immutable bindings and the binding being added are never evicted, immutable bindings are
+    renewed instead of expiring.
+
+    As with the `WeakValueBindingStorage`, this means that bindings can get removed either explicitly,
+    or implicitly by expiration or eviction.  The number of implicitly removed bindings is tracked in
+    the `metrics` counter.
+
+    :param time_to_live: the number of seconds after which a binding that was not renewed expires.
+    :param max_size: the maximum number of bindings kept in the storage.
+    """
+
+    indexable = False
+
+    def __init__(self, binding_type, time_to_live=600, max_size=1000):
+        assert time_to_live > 0
+        assert max_size > 0
+        super().__init__(binding_type)
+        self.time_to_live = time_to_live
+        self.max_size = max_size
+        # bindings are ordered by their expiration time
+        self._bindings = collections.OrderedDict()
+        self._expiries = dict()
+        self.metrics = collections.Counter()
+        # Reading bindings expires them, so even reads need to be serialized.
+        self._lock = threading.RLock()
+
+    def _renew(self, name, now):
+        self._expiries[name] = now + self.time_to_live
+        self._bindings.move_to_end(name)
+
+    def _evict(self, name, reason):
+        del self._bindings[name]
+        del self._expiries[name]
+        self.metrics[reason] += 1
+
+    def _expire(self):
+        """
+        Remove the bindings of which the time to live has passed.
+        """
+        now = time.monotonic()
+        while len(self._bindings):
+            name = next(iter(self._bindings))
+            if self._expiries[name] > now:
+                break
+            if name in self._immutable:
+                self._renew(name, now)
+            else:
+                self._evict(name, 'expired')
+
+    def add(self, name, obj, immutable=False):
+        with self._lock:
+            self._expire()
+            super().add(name, obj, immutable)
+            now = time.monotonic()
+            self._renew(name, now)
+            evicted = []
+            while len(self._bindings) > self.max_size:
+                oldest_name = next(iter(self._bindings))
+                # Never evict the binding that is being added.  Immutable bindings are renewed
+                # instead, so once the added binding is the oldest, only immutable bindings remain.
+                if oldest_name == name:
+                    break
+                if oldest_name in self._immutable:
+                    self._renew(oldest_name, now)
+                    continue
+                self._evict(oldest_name, 'evicted')
+                evicted.append(oldest_name)
+            if evicted:
+                LOGGER.warning('Maximum number of {} bindings reached, evicted {} bindings before their time to live passed, first : {}'.format(
+                    self.max_size, len(evicted), evicted[0]
+                ))
+
+    def remove(self, name):
+        with self._lock:
+            self._expire()
+            obj = super().remove(name)
+            del self._expiries[name]
+            return obj
+
+    def get(self, name):
+        with self._lock:
+            self._expire()
+            return super().get(name)
+
+    def renew(self, name):
+        """
+        Reset the time to live of the binding under the given name.
+
+        :raises:
+            NameNotFoundException NamingException.Message.name_not_found: if no binding was found for the given name.
+        """
+        with self._lock:
+            self._expire()
+            if name not in self._bindings:
+                raise NameNotFoundException(name, self.binding_type)
+            self._renew(name, time.monotonic())
+            self.metrics['renewed'] += 1
+
+    def copy(self):
+        duplicate = self.__class__(self.binding_type, self.time_to_live, self.max_size)
+        with self._lock:
+            # keep the expiration times, and the order of the bindings
+            duplicate._bindings.update(self._bindings)
+            duplicate._expiries.update(self._expiries)
+            duplicate._immutable.update(self._immutable)
+        return duplicate
+
+    def list(self):
+        with self._lock:
+            self._expire()
+            return super().list()
+
+    def oldest_timestamp(self):
+        """
+        :return: the `time.monotonic` timestamp at which the binding that was not renewed for
+            the longest time was added or renewed, or None if the storage is empty.
+        """
+        with self._lock:
+            self._expire()
+            for name in self._bindings:
+                return self._expiries[name] - self.time_to_live
+
+    def __contains__(self, name):
+        with self._lock:
+            self._expire()
+            return super().__contains__(name)
+
+    def __len__(self):
+        with self._lock:
+            self._expire()
+            return super().__len__()
+
 class NamingContext(AbstractNamingContext):
     """
     Represents a naming context, which consists of a set of name-to-object bindings.
@@ -468,6 +1000,11 @@ class NamingContext(AbstractNamingContext):
     def __init__(self):
         super().__init__()
         self._bindings = {btype: BindingStorage(btype) for btype in BindingType}
+        # Lock that serializes the changes to the bindings of this context, resolving does not acquire it.
+        self._lock = threading.RLock()
+        # The number of changes to the bindings, and the sorted keys of the bindings after a number of changes.
+        self._changes = 0
+        self._sorted_keys = (None, [])
 
     @AbstractNamingContext.check_bounded
     def bind(self, name: Name, obj: object, immutable=False) -> CompositeName:
@@ -625,29 +1162,44 @@ class NamingContext(AbstractNamingContext):
         if binding_type not in BindingType:
             raise NamingException(NamingException.Message.invalid_binding_type)
         if len(name) == 1:
-            # If binding, check if their exists one already
-            if name[0] in self._bindings[binding_type] and not rebind:
-                raise AlreadyBoundException(name[0], binding_type)
-            # Add the object and its mutability to the registry for the given binding_type.
-            self._bindings[binding_type].add(name[0], obj, immutable)
-            # Determine the full qualified named of the bound object (extending that of this NamingContext).
-            qual_name = self.get_qual_name(name[0])
-            # If the object is a NamingContext, assign the qualified name.
-            if binding_type == BindingType.named_context:
-                if obj._name is not None:
+            with self._lock:
+                # If binding, check if their exists one already
+                if name[0] in self._bindings[binding_type] and not rebind:
                     raise AlreadyBoundException(name[0], binding_type)
-                obj._name = qual_name
-            return qual_name
+                # When rebinding a context, the replaced context should leave the path index.
+                replaced = None
+                if binding_type == BindingType.named_context and name[0] in self._bindings[binding_type]:
+                    replaced = self._bindings[binding_type].get(name[0])
+                # Add the object and its mutability to the registry for the given binding_type.
+                self._bindings[binding_type].add(name[0], obj, immutable)
+                self._changes += 1
+                # Determine the full qualified named of the bound object (extending that of this NamingContext),
+                # all of its parts have been validated by now.
+                qual_name = ValidatedName(self.get_qual_name(name[0]))
+                # If the object is a NamingContext, assign the qualified name.
+                if binding_type == BindingType.named_context:
+                    if obj._name is not None:
+                        raise AlreadyBoundException(name[0], binding_type)
+                    if replaced is not None and replaced is not obj:
+                        replaced._detach_index()
+                    obj._name = qual_name
+                # Keep the path index of the initial naming context in sync.
+                if self._index is not None:
+                    if self._bindings[binding_type].indexable:
+                        self._index[binding_type][qual_name] = obj
+                    if binding_type == BindingType.named_context:
+                        obj._attach_index(self._index)
+                return qual_name
         else:
             context = self._bindings[BindingType.named_context].get(name[0])
             if binding_type == BindingType.named_context:
                 if rebind:
-                    return context.rebind_context(name[1:], obj)
-                return context.bind_context(name[1:], obj)
+                    return context.rebind_context(_tail(name), obj)
+                return context.bind_context(_tail(name), obj)
             elif binding_type == BindingType.named_object:
                 if rebind:
-                    return context.rebind(name[1:], obj)
-                return context.bind(name[1:], obj)
+                    return context.rebind(_tail(name), obj)
+                return context.bind(_tail(name), obj)
 
     @AbstractNamingContext.check_bounded
     def unbind(self, name: Name) -> None:
@@ -667,6 +1219,50 @@ class NamingContext(AbstractNamingContext):
         """
         self._remove_binding(name, BindingType.named_object)
 
+    @AbstractNamingContext.check_bounded
+    def unbind_many(self, names: typing.Iterable[Name]) -> typing.List[typing.Optional[NamingException]]:
+        """
+        Remove multiple object bindings from this NamingContext at once.
+        Singular names are removed from this context in a single pass, while composite names are grouped by
+        their first atomic part, so that each subcontext is resolved only once and receives its names as a single batch.
+
+        :param names: an iterable of names, atomic or composite, and relative to this naming context.
+
+        :return: a list with for each of the given names, in the same order, either None if the binding
+            was removed, or the NamingException that was raised while removing it.
+
+        :raises:
+            UnboundException NamingException.unbound: if this NamingContext has not been bound to a name yet.
+        """
+        names = list(names)
+        results = [None] * len(names)
+        names_by_context = collections.defaultdict(list)
+        storage = self._bindings[BindingType.named_object]
+        with self._lock:
+            for i, name in enumerate(names):
+                try:
+                    name = self.get_composite_name(name)
+                    if len(name) == 1:
+                        storage.remove(name[0])
+                        self._changes += 1
+                        if self._index is not None:
+                            self._index[BindingType.named_object].pop((*self._name, name[0]), None)
+                    else:
+                        names_by_context[name[0]].append((i, _tail(name)))
+                except NamingException as e:
+                    results[i] = e
+        for context_name, positions in names_by_context.items():
+            try:
+                context = self._bindings[BindingType.named_context].get(context_name)
+            except NamingException as e:
+                for i, _name in positions:
+                    results[i] = e
+                continue
+            context_results = context.unbind_many([name for _i, name in positions])
+            for (i, _name), result in zip(positions, context_results):
+                results[i] = result
+        return results
+
     @AbstractNamingContext.check_bounded
     def unbind_context(self, name: Name) -> None:
         """
@@ -708,15 +1304,20 @@ class NamingContext(AbstractNamingContext):
         if binding_type not in BindingType:
             raise NamingException(NamingException.Message.invalid_binding_type)
         if len(name) == 1:
-            obj = self._bindings[binding_type].remove(name[0])
-            if binding_type == BindingType.named_context:
-                obj._name = None
+            with self._lock:
+                obj = self._bindings[binding_type].remove(name[0])
+                self._changes += 1
+                if self._index is not None:
+                    self._index[binding_type].pop((*self._name, name[0]), None)
+                if binding_type == BindingType.named_context:
+                    obj._detach_index()
+                    obj._name = None
         else:
             context = self._bindings[BindingType.named_context].get(name[0])
             if binding_type == BindingType.named_context:
-                context.unbind_context(name[1:])
+                context.unbind_context(_tail(name))
             elif binding_type == BindingType.named_object:
-                context.unbind(name[1:])
+                context.unbind(_tail(name))
 
     @AbstractNamingContext.check_bounded
     def resolve(self, name: Name) -> object:
@@ -775,20 +1376,146 @@ class NamingContext(AbstractNamingContext):
         else:
             context = self._bindings[BindingType.named_context].get(name[0])
             if binding_type == BindingType.named_context:
-                return context.resolve_context(name[1:])
+                return context.resolve_context(_tail(name))
             elif binding_type == BindingType.named_object:
-                return context.resolve(name[1:])
+                return context.resolve(_tail(name))
+
+    @AbstractNamingContext.check_bounded
+    def resolve_many(self, names: typing.Iterable[Name]) -> typing.List[object]:
+        """
+        Resolve multiple names in this NamingContext at once.
+        Singular names are looked up in this context, while composite names are grouped by their first atomic part,
+        so that each subcontext is resolved only once and receives its names as a single batch.
+
+        :param names: an iterable of names, atomic or composite, and relative to this naming context.
+
+        :return: a list with for each of the given names, in the same order, either the bound object
+            or the NamingException that was raised while resolving it.
+
+        :raises:
+            UnboundException NamingException.unbound: if this NamingContext has not been bound to a name yet.
+        """
+        names = list(names)
+        results = [None] * len(names)
+        names_by_context = collections.defaultdict(list)
+        for i, name in enumerate(names):
+            try:
+                name = self.get_composite_name(name)
+                if len(name) == 1:
+                    results[i] = self._bindings[BindingType.named_object].get(name[0])
+                else:
+                    names_by_context[name[0]].append((i, _tail(name)))
+            except NamingException as e:
+                results[i] = e
+        for context_name, positions in names_by_context.items():
+            try:
+                context = self._bindings[BindingType.named_context].get(context_name)
+            except NamingException as e:
+                for i, _name in positions:
+                    results[i] = e
+                continue
+            context_results = context.resolve_many([name for _i, name in positions])
+            for (i, _name), result in zip(positions, context_results):
+                results[i] = result
+        return results
+
+    def _attach_index(self, index):
+        """
+        Register this context and all of its (indexable) bindings, recursively through its subcontexts,
+        in the given path index.
+        """
+        with self._lock:
+            super()._attach_index(index)
+            for binding_type in BindingType:
+                storage = self._bindings[binding_type]
+                for (atomic_name,) in storage.list():
+                    obj = storage.get(atomic_name)
+                    if storage.indexable:
+                        index[binding_type][(*self._name, atomic_name)] = obj
+                    if binding_type == BindingType.named_context:
+                        obj._attach_index(index)
+
+    def _detach_index(self):
+        """
+        Remove this context and all of its bindings, recursively through its subcontexts,
+        from the path index it was registered in.
+        """
+        with self._lock:
+            index = self._index
+            if index is None:
+                return
+            for binding_type in BindingType:
+                storage = self._bindings[binding_type]
+                for (atomic_name,) in storage.list():
+                    index[binding_type].pop((*self._name, atomic_name), None)
+                    if binding_type == BindingType.named_context:
+                        storage.get(atomic_name)._detach_index()
+            super()._detach_index()
 
     def list(self):
-        yield from self._bindings[BindingType.named_object].list()
-        for name_of_named_context in self._bindings[BindingType.named_context].list():
-            named_context = self.resolve_context(name_of_named_context)
-            for name_in_named_context in named_context.list():
-                yield (*name_of_named_context, *name_in_named_context)
+        for name, _binding_type in self.iter_names(binding_type=BindingType.named_object):
+            yield name
+
+    def _list_keys(self):
+        changes, keys = self._sorted_keys
+        if changes != self._changes:
+            with self._lock:
+                changes = self._changes
+                keys = sorted(
+                    (atomic_name, binding_type.value)
+                    for binding_type in BindingType for (atomic_name,) in self._bindings[binding_type].list()
+                )
+                self._sorted_keys = (changes, keys)
+        return keys
+
+    def _get_entry(self, atomic_name, binding_type):
+        return self._bindings[binding_type].get(atomic_name)
+
+    def stats(self) -> dict:
+        """
+        Report statistics on the bindings in this context and its subcontexts.
+        The size of the bound objects is approximated by their own size and that of the items they contain directly,
+        objects referenced deeper are not taken into account.
+
+        :see: camelot.core.naming.AbstractNamingContext.stats
+        """
+        now = time.monotonic()
+        storage = self._bindings[BindingType.named_object]
+        result = super().stats()
+        with self._lock:
+            result['bindings'] = len(storage)
+            result['total_bindings'] = result['bindings']
+            for (atomic_name,) in storage.list():
+                try:
+                    result['size'] += _approximate_size(storage.get(atomic_name))
+                except NameNotFoundException:
+                    continue
+            oldest_timestamp = storage.oldest_timestamp()
+        if oldest_timestamp is not None:
+            result['oldest_binding_age'] = now - oldest_timestamp
+        for (atomic_name,) in self._bindings[BindingType.named_context].list():
+            context_stats = self._bindings[BindingType.named_context].get(atomic_name).stats()
+            result['subcontexts'][atomic_name] = context_stats
+            result['total_bindings'] += context_stats['total_bindings']
+            result['size'] += context_stats['size']
+            if context_stats['oldest_binding_age'] is not None:
+                result['oldest_binding_age'] = max(result['oldest_binding_age'] or 0, context_stats['oldest_binding_age'])
+        return result
 
     def __len__(self):
         return len(self._bindings[BindingType.named_object])
 
+def _approximate_size(obj):
+    """
+    Approximate the number of bytes retained by an object, including the items of a container, but not deeper.
+    """
+    size = sys.getsizeof(obj)
+    if isinstance(obj, (tuple, list, set, frozenset)):
+        size += sum(sys.getsizeof(item) for item in obj)
+    elif isinstance(obj, dict):
+        size += sum(sys.getsizeof(key) + sys.getsizeof(value) for key, value in obj.items())
+    return size
+
 class EndpointNamingContext(AbstractNamingContext):
     """
     Interface for a naming context that only supports binding and resolving objects/values,
@@ -877,10 +1604,17 @@ class ConstantNamingContext(EndpointNamingContext):
             AssertionError: if the provided constant_type is not a valid instance of ´camelot.core.naming.Constant´.
     """
 
+    # Constant types of which the resolved objects are immutable and expensive to construct,
+    # for which the resolved objects are kept in a bounded LRU cache.
+    cached_constant_types = ('decimal', 'date', 'datetime')
+    decode_cache_size = 1024
+
     def __init__(self, constant_type):
         super().__init__()
         assert isinstance(constant_type, Constant)
         self.constant_type = constant_type
+        if constant_type.name in self.cached_constant_types:
+            self._decode = functools.lru_cache(maxsize=self.decode_cache_size)(self._decode)
 
     @AbstractNamingContext.check_bounded
     def resolve(self, name: Name) -> object:
@@ -897,7 +1631,12 @@ class ConstantNamingContext(EndpointNamingContext):
             NamingException NamingException.Message.invalid_name: when the name is invalid.
             NameNotFoundException NamingException.Message.name_not_found: if no binding was found for the given name.
         """
-        name = self.get_composite_name(name)
+        return self._decode(self.get_composite_name(name))
+
+    def _decode(self, name: CompositeName) -> object:
+        """
+        Construct the constant object a validated composite name refers to.
+        """
         try:
             # Convert atomic parts if the composite type does not support string-conversion of its arguments.
             if self.constant_type.atomic_type != str:
@@ -953,17 +1692,29 @@ class EntityNamingContext(EndpointNamingContext):
     But in contrast to constant naming contexts, entity naming context's resolution process is not guaranteed to be idempotent,
     as it relies on querying the database for its supported entity, which by nature is a mutable backend.
 
+    Resolution first looks for the instance in the identity map of its session, and only queries the database
+    when the instance is not present there.  Within a `resolution_memo` block, such as the resolution of the names
+    in a single request, each name is resolved only once.  How often each of these paths is taken is tracked in the
+    `resolution_counters` of each context.
+
     :param constant_type: the entity class this naming context should handle, a subclass of ´camelot.core.orm.entity.Entity´
 
     :raises:
             AssertionError: if the provided entity class is not a subclass of ´camelot.core.orm.entity.Entity´
     """
 
+    # The maximum number of primary keys in the `IN` clause of a single query of `resolve_many`.
+    query_chunk_size = 500
+    # Memo of the instances resolved within the active resolution_memo block of each thread.
+    _memo_local = threading.local()
+
     def __init__(self, entity):
         super().__init__()
         from vfinance.model.entity import EntityBase
         assert issubclass(entity, EntityBase)
         self.entity = entity
+        # Counters of the resolution paths taken by this context.
+        self.resolution_counters = collections.Counter()
 
     def validate_atomic_name(self, name: str) -> bool:
         """
@@ -1018,12 +1769,166 @@ class EntityNamingContext(EndpointNamingContext):
             NameNotFoundException NamingException.Message.name_not_found: if no binding was found for the given name.
         """
         name = self.get_composite_name(name)
+        memo = getattr(EntityNamingContext._memo_local, 'memo', None)
+        if memo is not None:
+            instance = self._get_from_memo(memo, name)
+            if instance is not None:
+                return instance
         session = orm.session._sessions.get(int(name[0]))
-        instance = session.query(self.entity).get(name[1:]) if session is not None else None
+        instance = None
+        if session is not None:
+            instance = self._get_from_identity_map(session, self._primary_key(name[1:]))
+            if instance is None:
+                self.resolution_counters['queries'] += 1
+                instance = session.query(self.entity).get(name[1:])
         if instance is None:
             raise NameNotFoundException(name[0], BindingType.named_object)
+        if memo is not None:
+            memo[(self.entity, name)] = instance
+        return instance
+
+    @staticmethod
+    def _primary_key(values):
+        """
+        Normalize the parts of a name, or the primary key values of an instance, to the primary key
+        used to lookup and match instances.
+        """
+        return tuple(int(value) for value in values)
+
+    def _get_from_identity_map(self, session, primary_key):
+        """
+        Lookup an instance of this context's entity in the identity map of the given session, without emitting SQL.
+
+        :param primary_key: the primary key, as normalized by `_primary_key`.
+        :return: the instance, or None if it is not present in the identity map, or if it is expired or deleted,
+            in which case the database should be queried.
+        """
+        mapper = orm.class_mapper(self.entity)
+        identity_key = mapper.identity_key_from_primary_key(list(primary_key))
+        instance = session.identity_map.get(identity_key)
+        if instance is not None and isinstance(instance, self.entity) and self._is_current(instance):
+            self.resolution_counters['identity_map_hits'] += 1
+            return instance
+        self.resolution_counters['identity_map_misses'] += 1
+        return None
+
+    def _get_from_memo(self, memo, name):
+        """
+        Lookup an instance in the memo of the active `resolution_memo` block.
+
+        :return: the instance, or None if it is not in the memo, or if it has been expired or deleted since
+            it was memoized, in which case it should be resolved again.
+        """
+        instance = memo.get((self.entity, name))
+        if instance is None:
+            return None
+        if not self._is_current(instance):
+            del memo[(self.entity, name)]
+            return None
+        self.resolution_counters['memo_hits'] += 1
         return instance
 
+    @staticmethod
+    def _is_current(instance):
+        """
+        :return: True if the instance can be used without querying the database, False if it is expired or deleted.
+        """
+        state = inspect(instance)
+        return not (state.expired or state.deleted or state.was_deleted)
+
+    @classmethod
+    @contextlib.contextmanager
+    def resolution_memo(cls):
+        """
+        Context manager during which the entity instances resolved by any entity naming context are memoized,
+        so repeated names are resolved only once.  Only found instances are memoized, and the memo is
+        discarded when leaving the outermost block.  Each thread has its own memo.
+
+        As the memo holds strong references to the instances, the block should only contain the resolution
+        of the names of a request, and not the execution of the action steps that follow it.
+        """
+        local = EntityNamingContext._memo_local
+        if getattr(local, 'memo', None) is not None:
+            yield
+            return
+        local.memo = dict()
+        try:
+            yield
+        finally:
+            local.memo = None
+
+    @AbstractNamingContext.check_bounded
+    def resolve_many(self, names: typing.Iterable[Name]) -> typing.List[object]:
+        """
+        Resolve multiple names in this EntityNamingContext at once.
+        The names are grouped by the session they refer to, and the instances of each session
+        are loaded with a query on their primary keys per `query_chunk_size` keys.
+
+        :param names: an iterable of names, atomic or composite, and relative to this naming context.
+
+        :return: a list with for each of the given names, in the same order, either the bound entity instance
+            or the NamingException that was raised while resolving it.
+
+        :raises:
+            UnboundException NamingException.unbound: if this NamingContext has not been bound to a name yet.
+        """
+        names = list(names)
+        results = [None] * len(names)
+        memo = getattr(EntityNamingContext._memo_local, 'memo', None)
+        names_by_session = collections.defaultdict(list)
+        for i, name in enumerate(names):
+            try:
+                name = self.get_composite_name(name)
+            except NamingException as e:
+                results[i] = e
+                continue
+            if memo is not None:
+                instance = self._get_from_memo(memo, name)
+                if instance is not None:
+                    results[i] = instance
+                    continue
+            names_by_session[name[0]].append((i, name, self._primary_key(name[1:])))
+        mapper = orm.class_mapper(self.entity)
+        for session_id, positions in names_by_session.items():
+            instances = dict()
+            session = orm.session._sessions.get(int(session_id))
+            if session is not None:
+                primary_keys = set()
+                for _i, _name, primary_key in positions:
+                    if primary_key in instances or primary_key in primary_keys:
+                        continue
+                    instance = self._get_from_identity_map(session, primary_key)
+                    if instance is not None:
+                        instances[primary_key] = instance
+                    else:
+                        primary_keys.add(primary_key)
+                primary_keys = list(primary_keys)
+                # stay below the limit on the number of parameters of a statement of the database
+                for chunk_start in range(0, len(primary_keys), self.query_chunk_size):
+                    chunk = primary_keys[chunk_start:chunk_start + self.query_chunk_size]
+                    self.resolution_counters['queries'] += 1
+                    query = session.query(self.entity).filter(self._primary_key_clause(mapper, chunk))
+                    for instance in query:
+                        instances[self._primary_key(mapper.primary_key_from_instance(instance))] = instance
+            for i, name, primary_key in positions:
+                instance = instances.get(primary_key)
+                if instance is None:
+                    results[i] = NameNotFoundException(name, BindingType.named_object)
+                    continue
+                if memo is not None:
+                    memo[(self.entity, name)] = instance
+                results[i] = instance
+        return results
+
+    @staticmethod
+    def _primary_key_clause(mapper, primary_keys):
+        """
+        Construct the `IN` clause that selects the instances of the given mapper with one of the given primary keys.
+        """
+        if len(mapper.primary_key) == 1:
+            return mapper.primary_key[0].in_([primary_key[0] for primary_key in primary_keys])
+        return tuple_(*mapper.primary_key).in_(primary_keys)
+
     def list(self):
         """
         The database might contain a very large number of entities, to avoid looping over all entities in the
@@ -1045,19 +1950,143 @@ class WeakRefNamingContext(NamingContext):
         super().__init__()
         self._bindings[BindingType.named_object] = WeakValueBindingStorage(BindingType.named_object)
 
+class CompactNamingContext(NamingContext):
+    """
+    Specialized naming context that stores its set of name-to-object bindings in a `CompactBindingStorage`,
+    for contexts that hold a large number of bindings, such as those of the running actions and model contexts.
+    The contexts created by this context are compact as well.
+    """
+
+    def __init__(self):
+        super().__init__()
+        self._bindings = {btype: CompactBindingStorage(btype) for btype in BindingType}
+
+class ReclaimableNamingContext(CompactNamingContext):
+    """
+    Specialized naming context that stores its named object bindings in a `ReferenceCountingBindingStorage`.
+    A primary use case for this naming context are the objects that are bound only to send their name to the client :
+    each time an object is bound, the client receives a reference to it, and it should unbind the name for each
+    of them once it no longer needs the object.  The binding is reclaimed once all references are released.
+
+    This requires exactly one unbind per copy of the name that was sent : a client that unbinds a name
+    more often releases the references of other users of the same object, while a client that unbinds
+    it less often keeps the object alive for the lifetime of the context.
+    """
+
+    def __init__(self):
+        super().__init__()
+        self._bindings[BindingType.named_object] = ReferenceCountingBindingStorage(BindingType.named_object)
+
+    @property
+    def metrics(self) -> collections.Counter:
+        """
+        The number of live and reclaimed named object bindings in this context.
+        """
+        storage = self._bindings[BindingType.named_object]
+        metrics = collections.Counter(storage.metrics)
+        metrics['live'] = len(storage)
+        return metrics
+
+class LeaseNamingContext(NamingContext):
+    """
+    Specialized naming context that stores its set of name-to-object bindings in an `ExpiringBindingStorage`.
+    A primary use case for this naming context are leases : objects that are bound on behalf of the client,
+    and that the client should unbind once it no longer needs them.  Should the client fail to do so,
+    the leases expire or get evicted, so the context cannot grow without bound.
+
+    :param time_to_live: the number of seconds after which a named object binding that was not renewed expires.
+    :param max_size: the maximum number of named object bindings kept in this context.
+    """
+
+    def __init__(self, time_to_live=600, max_size=1000):
+        super().__init__()
+        self._bindings[BindingType.named_object] = ExpiringBindingStorage(BindingType.named_object, time_to_live, max_size)
+
+    @AbstractNamingContext.check_bounded
+    def renew(self, name: Name) -> None:
+        """
+        Reset the time to live of a named object binding in this LeaseNamingContext.
+        If the name is composed out of multiple parts, the first part is resolved in this context, expecting a bound LeaseNamingContext,
+        and the remaining parts are renewed in that resulting context.
+
+        :param name: name under which the object should have been bound, atomic or composite, and relative to this naming context.
+
+        :raises:
+            UnboundException NamingException.unbound: if this NamingContext has not been bound to a name yet.
+            NamingException NamingException.Message.invalid_name: when the name is invalid (None or length less than 1).
+            NameNotFoundException NamingException.Message.name_not_found: if no binding was found for the given name.
+        """
+        name = self.get_composite_name(name)
+        if len(name) == 1:
+            self._bindings[BindingType.named_object].renew(name[0])
+        else:
+            self._bindings[BindingType.named_context].get(name[0]).renew(_tail(name))
+
+    @property
+    def metrics(self) -> collections.Counter:
+        """
+        The number of expired, evicted and renewed named object bindings in this context.
+        """
+        return self._bindings[BindingType.named_object].metrics
+
+def _encode_constant(constant_type: Constant, *atomic_names: str) -> ValidatedName:
+    return ValidatedName(('constant', constant_type.name, *atomic_names))
+
+def _encode_float(obj):
+    raise NotImplementedError('Use Decimal instead')
+
+def _encode_entity(obj):
+    session = orm.object_session(obj)
+    if session is None:
+        raise NotImplementedError('Only entity instances that are bound to a session are supported')
+    primary_key = orm.object_mapper(obj).primary_key_from_instance(obj)
+    if not inspect(obj).persistent or None in primary_key:
+        raise NotImplementedError('Only persistent entity instances are supported')
+    entity = type(obj)
+    return ValidatedName(('entity', entity.endpoint.resource_name, str(session.hash_key), *[str(key) for key in primary_key]))
+
+_null_name = ValidatedName(('constant', 'null'))
+_true_name = ValidatedName(('constant', 'true'))
+_false_name = ValidatedName(('constant', 'false'))
+
 class InitialNamingContext(NamingContext, metaclass=Singleton):
     """
     Singleton class that is the starting context for performing naming operations.
     All naming operations are relative to a context.
     This initial context implements the NamingContext interface and provides the starting point for resolution of names.
+
+    On top of the recursive resolution, the initial context keeps a path index that maps the fully qualified
+    composite names of all bindings in its hierarchy directly to the bound objects.  This index is kept in sync
+    by the contexts in the hierarchy whenever a binding is added or removed, and allows resolving deep names
+    with a single lookup.  Bindings in storages that are not indexable, as well as names handled by endpoint
+    contexts, are resolved recursively.
     """
 
+    # Functions that construct the names of objects of a type, used by `_bind_object`.
+    # The encoder for a datetime is found before that of a date, and the one of a bool before that of an int,
+    # as the method resolution order of the type is used to lookup its encoder.
+    object_encoders = {
+        type(None): lambda obj: _null_name,
+        bool: lambda obj: _true_name if obj else _false_name,
+        int: lambda obj: _encode_constant(Constant.integer, str(obj)),
+        str: lambda obj: _encode_constant(Constant.string, str(obj)),
+        # Normalize decimals to remove trailing zeros, to allow equality comparisons between named bindings.
+        Decimal: lambda obj: _encode_constant(Constant.decimal, str(obj.normalize())),
+        QtGui.QColor: lambda obj: _encode_constant(Constant.color, obj.name()),
+        datetime.datetime: lambda obj: _encode_constant(Constant.time, str(obj.year), str(obj.month), str(obj.day), str(obj.hour), str(obj.minute), str(obj.second)),
+        datetime.date: lambda obj: _encode_constant(Constant.date, str(obj.year), str(obj.month), str(obj.day)),
+        float: _encode_float,
+    }
+    # Cache of the encoder to use for each type encountered, None for types bound in the 'object' context.
+    _encoders_by_type = dict()
+
     def __init__(self):
         super().__init__()
         # Initialize the name of this InitialNamingContext to the empty tuple,
         # so that it becomes bounded but does not contribute to the full composite name
         # resolution of subcontexts.
         self._name = tuple()
+        self._index = {btype: dict() for btype in BindingType}
 
         # Add immutable bindings for constants' values and contexts for each supported 'constant' python type.
         constants = self.bind_new_context('constant', immutable=True)
@@ -1067,8 +2096,8 @@ class InitialNamingContext(NamingContext, metaclass=Singleton):
         constants.bind('true', True, immutable=True)
         constants.bind('false', False, immutable=True)
         self.bind_new_context('entity', immutable=True)
-        self.bind_new_context('object', immutable=True)
-        self.bind_new_context('leases', immutable=True)
+        self.bind_context('object', ReclaimableNamingContext(), immutable=True)
+        self.bind_context('leases', LeaseNamingContext(), immutable=True)
         self.bind_context('transient', WeakRefNamingContext(), immutable=True)
 
     def new_context(self) -> NamingContext:
@@ -1081,10 +2110,99 @@ class InitialNamingContext(NamingContext, metaclass=Singleton):
         """
         return NamingContext()
 
+    def resolve(self, name: Name) -> object:
+        """
+        Resolve a name in this InitialNamingContext and return the bound object,
+        using the path index before falling back on the recursive resolution.
+
+        :see: camelot.core.naming.NamingContext.resolve
+        """
+        try:
+            return self._index[BindingType.named_object][name]
+        except (KeyError, TypeError):
+            return super().resolve(name)
+
+    def resolve_context(self, name: Name) -> AbstractNamingContext:
+        """
+        Resolve a name in this InitialNamingContext and return the bound context,
+        using the path index before falling back on the recursive resolution.
+
+        :see: camelot.core.naming.NamingContext.resolve_context
+        """
+        try:
+            return self._index[BindingType.named_context][name]
+        except (KeyError, TypeError):
+            return super().resolve_context(name)
+
+    def resolve_many(self, names: typing.Iterable[Name]) -> typing.List[object]:
+        """
+        Resolve multiple names in this InitialNamingContext at once, using the path index
+        before falling back on the grouped resolution for the remaining names.
+
+        :see: camelot.core.naming.NamingContext.resolve_many
+        """
+        names = list(names)
+        results = [None] * len(names)
+        index = self._index[BindingType.named_object]
+        unindexed = []
+        for i, name in enumerate(names):
+            try:
+                results[i] = index[name]
+            except (KeyError, TypeError):
+                unindexed.append(i)
+        if unindexed:
+            for i, result in zip(unindexed, super().resolve_many([names[i] for i in unindexed])):
+                results[i] = result
+        return results
+
+    def get_validated_name(self, name: typing.Union[Name, typing.List[str]]) -> CompositeName:
+        """
+        Validate a name relative to this InitialNamingContext once, for example when it is received from the client,
+        so that it does not need to be validated again on every level of the recursive resolve.
+        Unless the name is bound in the path index, it is validated by each of the contexts along its path,
+        up to the endpoint context handling it, which validates all of the remaining parts.
+        Names of which the path could not be followed up to the end are returned unvalidated,
+        so that the naming operation they are used for raises the appropriate exception.
+
+        :param name: the name to validate, atomic, composite, or the list form of a composite name after deserialization.
+
+        :return: the name in its composite form, as a `ValidatedName` if its validation succeeded.
+
+        :raises:
+            NamingException NamingException.Message.invalid_name: The supplied name or one of its composed part is invalid.
+        """
+        if type(name) is ValidatedName:
+            return name
+        if isinstance(name, list):
+            name = tuple(name)
+        # Names present in the path index are bound, and thus have been validated when binding.
+        try:
+            for index in self._index.values():
+                if name in index:
+                    return ValidatedName(name)
+        except TypeError:
+            # the name contains unhashable parts, such as nested lists
+            raise NamingException(NamingException.Message.invalid_name, reason=NamingException.Message.invalid_composite_name_parts)
+        name = self.get_composite_name(name)
+        context, remainder = self, name
+        while len(remainder) > 1 and isinstance(context, NamingContext):
+            if remainder[0] not in context._bindings[BindingType.named_context]:
+                return name
+            context = context._bindings[BindingType.named_context].get(remainder[0])
+            remainder = context.get_composite_name(remainder[1:])
+        # get_composite_name only validated the first part of the remainder, while an endpoint
+        # context handles all of its parts itself.
+        for atomic_name in remainder[1:]:
+            context.validate_atomic_name(atomic_name)
+        return ValidatedName(name)
+
     def _bind_object(self, obj):
         """
         Helper method for binding any type of python object under the appropriate name.
         This functionality is meant for backend binding of objects and will always perform a mutable bind.
+        The name is constructed by the encoder registered for the type of the object, or the closest
+        of its base classes.  Objects for which no encoder is registered are bound in the 'object' context,
+        where they remain until the client has unbound every name it received for them.
 
         :param obj: the object to be bound.
 
@@ -1094,38 +2212,42 @@ class InitialNamingContext(NamingContext, metaclass=Singleton):
             UnboundException NamingException.unbound: if this NamingContext has not been bound to a name yet.
             NotImplementedError: if trying to bind an object which is not supported.
         """
-        from vfinance.model.entity import Entity
-        if obj is None:
-            return ('constant', 'null')
-        if isinstance(obj, bool):
-            return ('constant', 'true' if obj else 'false')
-        for constant_type in Constant:
-            if isinstance(obj, constant_type.composite_type):
-                base_name = ('constant', constant_type.name)
-                # Important to put the check on datetime first here, before the date check
-                # as datetimes are also dates.
-                if isinstance(obj, Constant.time.composite_type):
-                    return (*base_name, *[str(atomic_name) for atomic_name in [obj.year, obj.month, obj.day, obj.hour, obj.minute, obj.second]])
-                if isinstance(obj, Constant.date.composite_type):
-                    return (*base_name, *[str(atomic_name) for atomic_name in [obj.year, obj.month, obj.day]])
-                if isinstance(obj, Constant.decimal.composite_type):
-                    # Normalize decimals to remove trailing zeros, to allow equality comparisons between named bindings.
-                    return (*base_name, str(obj.normalize()))
-                if isinstance(obj, Constant.color.composite_type):
-                    return (*base_name, obj.name())
-                return (*base_name, str(obj))
-        if isinstance(obj, Entity):
-            session = orm.object_session(obj)
-            if session is None:
-                raise NotImplementedError('Only entity instances that are bound to a session are supported')
-            primary_key = orm.object_mapper(obj).primary_key_from_instance(obj)
-            if not inspect(obj).persistent or None in primary_key:
-                raise NotImplementedError('Only persistent entity instances are supported')
-            entity = type(obj)
-            return ('entity', entity.endpoint.resource_name, str(session.hash_key), *[str(key) for key in primary_key])
-        if isinstance(obj, float):
-            raise NotImplementedError('Use Decimal instead')
+        obj_type = type(obj)
+        try:
+            encoder = self._encoders_by_type[obj_type]
+        except KeyError:
+            encoder = self._encoders_by_type[obj_type] = self._get_object_encoder(obj_type)
+        if encoder is not None:
+            return encoder(obj)
         LOGGER.warn('Binding non-delegated object of type {}'.format(type(obj)))
         return self.rebind(('object', str(hash(obj))), obj)
 
+    @classmethod
+    def _get_object_encoder(cls, obj_type):
+        """
+        Lookup the encoder for the given type by walking its method resolution order.
+
+        :return: the encoder, or None if the object should be bound in the 'object' context.
+        """
+        for base in obj_type.__mro__:
+            encoder = cls.object_encoders.get(base)
+            if encoder is not None:
+                return encoder
+        from vfinance.model.entity import Entity
+        if issubclass(obj_type, Entity):
+            return _encode_entity
+        return None
+
+    @classmethod
+    def register_object_encoder(cls, obj_type: type, encoder: typing.Callable[[object], CompositeName]) -> None:
+        """
+        Register the function that constructs the name of objects of the given type and its subclasses,
+        for use by `_bind_object`.  The name returned by the encoder should resolve to an equal object.
+
+        :param obj_type: the type of the objects to encode.
+        :param encoder: a function that takes an object and returns its fully qualified composite name.
+        """
+        cls.object_encoders[obj_type] = encoder
+        cls._encoders_by_type.clear()
+
 initial_naming_context = InitialNamingContext()
@@ -1,14 +1,20 @@
 import dataclasses
 import datetime
 import functools
+import collections
 import io
 import base64
+import math
+import struct
+import time
+import typing
 
 import orjson
 
 from camelot.core.qt import QtCore, QtGui
 from enum import Enum
 
+from .naming import ValidatedName
 from .utils import ugettext_lazy
 
 
@@ -31,6 +37,43 @@ class Serializable(object):
         state = orjson.loads(stream.read())
         self.__dict__.update(state)
 
+    def to_buffer(self, codec=None):
+        """
+        Serialize the object to bytes, to be handed over to the client.
+        While the `serialization_profiler` is enabled, the size of the bytes
+        and the time spent producing them are recorded.
+
+        :param codec: the `AbstractCodec` to encode the object with, defaults to the JSON codec.
+        """
+        codec = codec or json_codec
+        if not serialization_profiler.enabled:
+            return self._to_buffer(codec)
+        start = time.perf_counter()
+        data = self._to_buffer(codec)
+        serialization_profiler.record(self._profiling_key(), len(data), time.perf_counter() - start)
+        return data
+
+    def _to_buffer(self, codec):
+        """
+        Serialize the object to the bytes produced by the codec.
+
+        This default implementation writes the object to an in memory stream,
+        subclasses that serialize to bytes directly should reimplement it to
+        avoid the intermediate copy.
+        """
+        stream = io.BytesIO()
+        self.write_object(stream)
+        if codec is json_codec:
+            return stream.getvalue()
+        return codec.encode(orjson.loads(stream.getvalue()))
+
+    def _profiling_key(self):
+        """
+        :return: the name under which the serialization of this object is accounted
+            by the `serialization_profiler`.
+        """
+        return type(self).__name__
+
     def _to_bytes(self):
         """
         Helper method to serialize the object to bytes.
@@ -38,9 +81,7 @@ class Serializable(object):
         The purpose of this method is to make unittesting easier, it is not
         intended for use in production code.
         """
-        stream = io.BytesIO()
-        self.write_object(stream)
-        return stream.getvalue()
+        return self.to_buffer()
 
     @classmethod
     def _from_bytes(cls, data):
@@ -67,35 +108,88 @@ class Serializable(object):
         return orjson.loads(self._to_bytes())
         
 
-def orjson_default(obj):
-    if isinstance(obj, ugettext_lazy):
-        return str(obj)
-    if isinstance(obj, QtGui.QKeySequence):
-        return obj.toString()
-    if isinstance(obj, Enum):
-        return obj.value
-    if isinstance(obj, QtCore.QJsonValue):
-        return obj.toVariant()
-    if isinstance(obj, QtGui.QImage):
+class ImageEncoder(object):
+    """
+    Encodes images to base64 strings for serialization.  The encoded images are kept in a
+    cache keyed on the `QImage.cacheKey`, which changes when an image is modified, so images
+    that are sent repeatedly, such as icons and decorations, are encoded only once.
+    The least recently used images are evicted from the cache when the total size of the
+    encoded images exceeds `max_size` bytes.
+
+    :param image_format: the format to encode the images in, such as 'PNG' or 'JPG'.
+    :param quality: the quality passed to `QImage.save`, for 'PNG' this is the inverse
+        of the compression level, for 'JPG' the quality of the lossy compression, and -1 for the default.
+    :param by_reference: when True, images are serialized as a dictionary with a 'ref' key,
+        holding a token that identifies the image, and a 'data' key with the encoded image,
+        which is only included the first time the image is serialized.  This requires the
+        client to keep the images it received.
+    :param max_size: the maximum total size of the cached encoded images.
+    """
+
+    def __init__(self, image_format='PNG', quality=-1, by_reference=False, max_size=16*1024*1024):
+        self._cache = collections.OrderedDict()
+        self._size = 0
+        self.metrics = collections.Counter()
+        self.configure(image_format, quality, by_reference, max_size)
+
+    def configure(self, image_format='PNG', quality=-1, by_reference=False, max_size=16*1024*1024):
+        """
+        Change the encoding of the images, which invalidates the cache.
+        """
+        assert max_size >= 0
+        self.image_format = image_format
+        self.quality = quality
+        self.by_reference = by_reference
+        self.max_size = max_size
+        self._cache.clear()
+        self._size = 0
+
+    def encode(self, image):
+        key = image.cacheKey()
+        data = self._cache.get(key)
+        if data is not None:
+            self.metrics['hits'] += 1
+            self._cache.move_to_end(key)
+            if self.by_reference:
+                return {'ref': str(key)}
+            return data
+        self.metrics['misses'] += 1
         byte_array = QtCore.QByteArray()
         buffer = QtCore.QBuffer(byte_array)
         buffer.open(QtCore.QIODevice.OpenModeFlag.WriteOnly)
-        obj.save(buffer, "PNG");
-        return base64.b64encode(byte_array).decode()
-        # FIXME: Remove this when all classes are serializable.
-        #        Currently needed to serialize some fields
-        #        (e.g. RouteWithRenderHint) from SetColumns._to_dict().
-    if isinstance(obj, DataclassSerializable):
-        return obj.asdict(obj)
-    if isinstance(obj, (datetime.date, datetime.datetime)):
-        raise TypeError("{} {} can not be serialized.".format(type(obj), obj))
-    # Since orjson is configured to passthough subclasses, these
-    # subclasses should be handled explicitly here.
-    if isinstance(obj, list):
-        return [orjson_default(v) for v in obj]
-    if isinstance(obj, str):
-        return str(obj)
-    raise TypeError
+        image.save(buffer, self.image_format, self.quality)
+        data = base64.b64encode(byte_array).decode()
+        if len(data) <= self.max_size:
+            self._cache[key] = data
+            self._size += len(data)
+            while self._size > self.max_size:
+                _key, evicted = self._cache.popitem(last=False)
+                self._size -= len(evicted)
+                self.metrics['evicted'] += 1
+        if self.by_reference:
+            return {'ref': str(key), 'data': data}
+        return data
+
+    def __len__(self):
+        return len(self._cache)
+
+
+image_encoder = ImageEncoder()
+
+
+def orjson_default(obj):
+    """
+    Convert the objects that orjson does not serialize natively, using the encoder
+    registered for their type in `_default_encoders`.
+    """
+    obj_type = type(obj)
+    try:
+        encoder = _encoders_by_type[obj_type]
+    except KeyError:
+        encoder = _encoders_by_type[obj_type] = _get_default_encoder(obj_type)
+    if encoder is None:
+        raise TypeError
+    return encoder(obj)
 
 
 class DataclassEncoderOrjson:
@@ -110,6 +204,242 @@ class DataclassEncoderOrjson:
 json_encoder = DataclassEncoderOrjson()
 
 
+class AbstractCodec(object):
+    """
+    A wire format to exchange serialized objects between the model and the GUI.
+    The codec is chosen per connection, and is used to encode the responses and
+    decode the requests.
+
+    .. attribute:: name
+
+        The name under which the codec is negotiated.
+
+    .. attribute:: native_dataclasses
+
+        True if the codec can encode dataclasses that allow orjson passthrough as they are.
+
+    .. attribute:: metrics
+
+        A counter with the number of encoded and decoded payloads and their total size in bytes.
+        While the `serialization_profiler` is enabled, the time spent encoding and decoding them
+        is counted as well, in seconds.
+    """
+
+    name = None
+    native_dataclasses = False
+
+    def __init__(self):
+        self.metrics = collections.Counter()
+
+    def encode(self, obj) -> bytes:
+        metrics = self.metrics
+        if not serialization_profiler.enabled:
+            data = self._encode(obj)
+        else:
+            start = time.perf_counter()
+            data = self._encode(obj)
+            metrics['encode_time'] += time.perf_counter() - start
+        metrics['encoded'] += 1
+        metrics['encoded_bytes'] += len(data)
+        return data
+
+    def decode(self, data: bytes):
+        metrics = self.metrics
+        if not serialization_profiler.enabled:
+            obj = self._decode(data)
+        else:
+            start = time.perf_counter()
+            obj = self._decode(data)
+            metrics['decode_time'] += time.perf_counter() - start
+        metrics['decoded'] += 1
+        metrics['decoded_bytes'] += len(data)
+        return obj
+
+    def _encode(self, obj) -> bytes:
+        raise NotImplementedError()
+
+    def _decode(self, data: bytes):
+        raise NotImplementedError()
+
+
+class JsonCodec(AbstractCodec):
+    """
+    The default codec, that exchanges objects as JSON text through orjson.
+    """
+
+    name = 'json'
+    native_dataclasses = True
+
+    def _encode(self, obj):
+        return json_encoder.encode(obj)
+
+    def _decode(self, data):
+        return orjson.loads(data)
+
+
+class BinaryCodec(AbstractCodec):
+    """
+    A compact binary codec, for payloads such as data updates, that consist mostly of
+    small integers and repeated strings.  Each value is encoded as a tag byte, followed
+    by its content :
+
+      * 0x00, 0x01 and 0x02 : null, false and true
+      * 0x03 : an integer, as a zigzag encoded varint
+      * 0x04 : a float, as a big-endian IEEE 754 double
+      * 0x05 : a string, as the varint length of its utf-8 encoding, followed by that encoding
+      * 0x06 : a reference to a previous string, as the varint index of that string
+      * 0x07 : an array, as its varint length followed by its items
+      * 0x08 : a map, as its varint length followed by its keys and values
+      * 0x80 to 0xff : the integers 0 to 127
+
+    Strings shorter than `max_reference_length` characters are assigned an index in the order
+    they first appear, so repeated strings, such as the names of fields, are encoded only once.
+
+    The decoded objects are the same as those decoded from JSON : keys of maps are converted to
+    strings, and non finite floats to null.  Objects that are no primitives are converted through
+    `orjson_default`, or to their JSON form if orjson serializes them natively, such as dates,
+    uuids and dataclasses.
+    """
+
+    name = 'binary'
+    max_reference_length = 32
+
+    _double = struct.Struct('>d')
+
+    def _encode(self, obj):
+        out = bytearray()
+        self._encode_value(obj, out, dict())
+        return bytes(out)
+
+    def _encode_value(self, obj, out, strings):
+        t = type(obj)
+        if t is str:
+            index = strings.get(obj)
+            if index is not None:
+                out.append(0x06)
+                self._write_varint(out, index)
+                return
+            if len(obj) < self.max_reference_length:
+                strings[obj] = len(strings)
+            encoded = obj.encode('utf-8')
+            out.append(0x05)
+            self._write_varint(out, len(encoded))
+            out += encoded
+        elif t is int:
+            if 0 <= obj < 0x80:
+                out.append(0x80 | obj)
+            else:
+                out.append(0x03)
+                self._write_varint(out, obj * 2 if obj >= 0 else -obj * 2 - 1)
+        elif obj is None:
+            out.append(0x00)
+        elif t is bool:
+            out.append(0x02 if obj else 0x01)
+        elif t is list or t is tuple:
+            out.append(0x07)
+            self._write_varint(out, len(obj))
+            for item in obj:
+                self._encode_value(item, out, strings)
+        elif t is dict:
+            out.append(0x08)
+            self._write_varint(out, len(obj))
+            for key, value in obj.items():
+                key_type = type(key)
+                if key_type is not str:
+                    key = str(key) if key_type is int else self._key_string(key)
+                self._encode_value(key, out, strings)
+                self._encode_value(value, out, strings)
+        elif t is float:
+            if math.isfinite(obj):
+                out.append(0x04)
+                out += self._double.pack(obj)
+            else:
+                out.append(0x00)
+        else:
+            try:
+                converted = orjson_default(obj)
+            except TypeError:
+                # the types orjson serializes natively are converted to their JSON form
+                converted = orjson.loads(json_encoder.encode(obj))
+            self._encode_value(converted, out, strings)
+
+    @staticmethod
+    def _key_string(key):
+        # the string to which orjson converts the key of a map
+        return next(iter(orjson.loads(json_encoder.encode({key: None}))))
+
+    @staticmethod
+    def _write_varint(out, n):
+        while n > 0x7f:
+            out.append((n & 0x7f) | 0x80)
+            n >>= 7
+        out.append(n)
+
+    def _decode(self, data):
+        data = bytes(data)
+        obj, position = self._decode_value(data, 0, [])
+        if position != len(data):
+            raise ValueError('Unexpected data after position {}'.format(position))
+        return obj
+
+    @staticmethod
+    def _read_varint(data, position):
+        n, shift = 0, 0
+        while True:
+            byte = data[position]
+            position += 1
+            n |= (byte & 0x7f) << shift
+            if byte < 0x80:
+                return n, position
+            shift += 7
+
+    def _decode_value(self, data, position, strings):
+        tag = data[position]
+        position += 1
+        if tag >= 0x80:
+            return tag & 0x7f, position
+        if tag == 0x06:
+            index, position = self._read_varint(data, position)
+            return strings[index], position
+        if tag == 0x05:
+            length, position = self._read_varint(data, position)
+            obj = data[position:position+length].decode('utf-8')
+            if len(obj) < self.max_reference_length:
+                strings.append(obj)
+            return obj, position + length
+        if tag == 0x03:
+            n, position = self._read_varint(data, position)
+            return (n >> 1) if not n & 1 else -((n + 1) >> 1), position
+        if tag == 0x07:
+            length, position = self._read_varint(data, position)
+            items = []
+            for _i in range(length):
+                item, position = self._decode_value(data, position, strings)
+                items.append(item)
+            return items, position
+        if tag == 0x08:
+            length, position = self._read_varint(data, position)
+            obj = dict()
+            for _i in range(length):
+                key, position = self._decode_value(data, position, strings)
+                obj[key], position = self._decode_value(data, position, strings)
+            return obj, position
+        if tag == 0x00:
+            return None, position
+        if tag in (0x01, 0x02):
+            return tag == 0x02, position
+        if tag == 0x04:
+            return self._double.unpack_from(data, position)[0], position + 8
+        raise ValueError('Invalid tag {} at position {}'.format(tag, position - 1))
+
+
+json_codec = JsonCodec()
+binary_codec = BinaryCodec()
+
+# The available codecs by the name under which they can be negotiated.
+codecs = {codec.name: codec for codec in (json_codec, binary_codec)}
+
+
 @functools.lru_cache(None)
 def _is_dataclass_type(t):
     """
@@ -139,15 +469,118 @@ def _dataclass_fields(t):
     """
     return dataclasses.fields(t)
 
+# Annotations of fields of which the values can be serialized as they are, without recursion.
+_primitive_annotations = frozenset((str, int, float, bool, type(None), 'str', 'int', 'float', 'bool'))
+
+def _is_primitive_annotation(annotation):
+    if annotation in _primitive_annotations:
+        return True
+    if typing.get_origin(annotation) is typing.Union:
+        return all(_is_primitive_annotation(arg) for arg in typing.get_args(annotation))
+    return False
+
+@functools.lru_cache(None)
+def _fields_serializer(cls, t):
+    """
+    Generate a function that serializes the fields of instances of the dataclass type t
+    to a dictionary, as `DataclassSerializable.serialize_fields` does.
+
+    The generated function accesses each field directly, and only passes the values of
+    fields that are not annotated as primitives through `cls._asdict_inner`.  The
+    function is generated once per type, and cached.
+    """
+    try:
+        type_hints = typing.get_type_hints(t)
+    except Exception:
+        # annotations that can not be evaluated are used as they are
+        type_hints = {}
+    items = []
+    for f in _dataclass_fields(t):
+        if _is_primitive_annotation(type_hints.get(f.name, f.type)):
+            items.append('{0!r}: obj.{0}'.format(f.name))
+        else:
+            items.append('{0!r}: asdict_inner(obj.{0})'.format(f.name))
+    source = 'def serialize_{}(obj):\n    return {{{}}}\n'.format(t.__name__, ', '.join(items))
+    namespace = {'asdict_inner': cls._asdict_inner}
+    exec(source, namespace)
+    return namespace['serialize_{}'.format(t.__name__)]
+
+def _annotated_dataclass_types(annotation):
+    """
+    Yield the dataclass types referenced by the given annotation, including those
+    nested in container and union annotations.
+    """
+    if isinstance(annotation, type):
+        if _is_dataclass_type(annotation):
+            yield annotation
+        return
+    for arg in typing.get_args(annotation):
+        yield from _annotated_dataclass_types(arg)
+
+def _serialize_fields_owner(t):
+    """
+    Return the class in the mro of type t that implements its `serialize_fields`.
+    """
+    for base in t.__mro__:
+        if 'serialize_fields' in base.__dict__:
+            return base
+
+# Cache of the result of `_is_orjson_passthrough` for each type.
+_orjson_passthrough_types = dict()
+
+def _is_orjson_passthrough(t):
+    """
+    Return True if instances of the dataclass type t can be passed to orjson as they are,
+    instead of being converted to a dictionary with `DataclassSerializable.asdict` first.
+
+    This is only the case if the type opted in by setting its `orjson_passthrough` attribute
+    to True.  Even then, the type should not customize its `serialize_fields`, and should not
+    have fields of which the name starts with an underscore or that are not set by its
+    constructor, as those are treated differently by orjson.  The dataclasses referenced in
+    the annotations of its fields should be passed through as well, as orjson serializes them
+    natively.
+    """
+    try:
+        return _orjson_passthrough_types[t]
+    except KeyError:
+        pass
+    # While determining the result, assume the type can not be passed through, to handle recursive types.
+    _orjson_passthrough_types[t] = False
+    fields = _dataclass_fields(t)
+    passthrough = t.orjson_passthrough is True and \
+        _serialize_fields_owner(t) in (DataclassSerializable, NamedDataclassSerializable) and \
+        not any(f.name.startswith('_') or not f.init for f in fields)
+    if passthrough:
+        try:
+            type_hints = typing.get_type_hints(t)
+        except Exception:
+            type_hints = {}
+        for f in fields:
+            for field_type in _annotated_dataclass_types(type_hints.get(f.name, f.type)):
+                if _serialize_fields_owner(field_type) is not DataclassSerializable or not _is_orjson_passthrough(field_type):
+                    passthrough = False
+    _orjson_passthrough_types[t] = passthrough
+    return passthrough
+
 class DataclassSerializable(Serializable):
     """
     Use the dataclass info to serialize the object
+
+    .. attribute:: orjson_passthrough
+
+        Controls whether instances are passed to orjson as they are, to serialize their fields natively,
+        instead of converting them to a dictionary with `asdict` first.  Classes should only opt in
+        when orjson serializes them to the same output as `asdict` : their instances should have no
+        attributes besides their fields, and the values of their fields that are not annotated precisely
+        should be serialized by orjson or `orjson_default`, and contain no dataclass instances.
     """
 
+    orjson_passthrough: typing.ClassVar[bool] = False
+
     def write_object(self, stream):
         # for chunk in json_encoder.iterencode(self.asdict(self)):
         #     stream.write(chunk.encode())
-        stream.write(json_encoder.encode(self.asdict(self)))
+        stream.write(self.to_buffer())
         # TODO: favored encode() over iterencode(), as the latter is actually slower for small objects.
         #   encode() is a thin wrapper around json.dumps implemented in C (CPython’s json module uses C accelerators when possible),
         #   while iterencode() may fall back to calling Python-level code more often and creating many intermediate small strings.
@@ -157,6 +590,12 @@ class DataclassSerializable(Serializable):
         #   to this would have to be heuristic based on the number of fields, types of fields, etc.
         # * use orjson or another 3rd party json library that is faster than the built-in json module.
         #   e.g., https://github.com/ijl/orjson
+
+    def _to_buffer(self, codec):
+        # Serialize the object to the bytes produced by the codec, without intermediate copies.
+        if codec.native_dataclasses and _is_orjson_passthrough(type(self)):
+            return codec.encode(self._passthrough_object(self))
+        return codec.encode(self.asdict(self))
     
     @classmethod
     def asdict(cls, obj):
@@ -167,12 +606,18 @@ class DataclassSerializable(Serializable):
         t = type(obj)
         if not _is_dataclass_type(t):
             raise TypeError("asdict() should be called on dataclass instances")
+        if _is_orjson_passthrough(t):
+            return t.serialize_fields(obj)
         return cls._asdict_inner(obj)
     
     @classmethod
     def _asdict_inner(cls, obj):
         t = type(obj)
         if _is_dataclass_type(t):
+            if _is_orjson_passthrough(t):
+                # nested instances are serialized by orjson natively, or converted by
+                # `orjson_default` for codecs that do not serialize dataclasses
+                return obj
             return t.serialize_fields(obj)
         if t is dict:
             return {k: cls._asdict_inner(v) for k, v in obj.items()}
@@ -180,6 +625,8 @@ class DataclassSerializable(Serializable):
             return [cls._asdict_inner(v) for v in obj]
         if t is tuple:
             return tuple(cls._asdict_inner(v) for v in obj)
+        if t is ValidatedName:
+            return tuple(obj)
         return obj
 
     @classmethod
@@ -188,11 +635,64 @@ class DataclassSerializable(Serializable):
         Serialize the given dataclass object's fields.
         By default this will return a dictionary with each field turned into a key-value pair of its name and its value.
         """
-        result = []
-        for f in _dataclass_fields(type(obj)):
-            value = cls._asdict_inner(getattr(obj, f.name))
-            result.append((f.name, value))
-        return dict(result)
+        return _fields_serializer(cls, type(obj))(obj)
+
+    def read_object(self, stream):
+        fields = orjson.loads(stream.read())
+        self.__dict__.update(typed_decoder.decode_fields(type(self), fields))
+
+    @classmethod
+    def _passthrough_object(cls, obj):
+        """
+        Return the object to pass to orjson to serialize the given dataclass object natively,
+        resulting in the same output as the serialization of the result of `serialize_fields`.
+        """
+        return obj
+
+def _raise_not_serializable(obj):
+    raise TypeError("{} {} can not be serialized.".format(type(obj), obj))
+
+# Functions that convert the objects orjson does not serialize natively, by type.
+# When the type of an object is a subclass of multiple registered types, the first one
+# in this list is used.
+_default_encoders = [
+    (ugettext_lazy, str),
+    (QtGui.QKeySequence, lambda obj: obj.toString()),
+    (Enum, lambda obj: obj.value),
+    (QtCore.QJsonValue, lambda obj: obj.toVariant()),
+    (QtGui.QImage, lambda obj: image_encoder.encode(obj)),
+    # FIXME: Remove this when all classes are serializable.
+    #        Currently needed to serialize some fields
+    #        (e.g. RouteWithRenderHint) from SetColumns._to_dict().
+    (DataclassSerializable, lambda obj: obj.asdict(obj)),
+    (datetime.date, _raise_not_serializable),
+    # Since orjson is configured to passthough subclasses, these
+    # subclasses should be handled explicitly here.
+    (ValidatedName, tuple),
+    (list, lambda obj: [orjson_default(v) for v in obj]),
+    (str, str),
+]
+
+# Cache of the encoder to use for each type encountered, None for types that can not be serialized.
+_encoders_by_type = dict()
+
+def _get_default_encoder(obj_type):
+    for encoded_type, encoder in _default_encoders:
+        if issubclass(obj_type, encoded_type):
+            return encoder
+    return None
+
+def register_default_encoder(obj_type: type, encoder: typing.Callable[[typing.Any], typing.Any]) -> None:
+    """
+    Register a function to convert objects of the given type, or its subclasses, that orjson does not
+    serialize natively, to objects it does serialize.  Encoders registered this way take precedence
+    over those registered before.
+
+    :param obj_type: the type of the objects to convert.
+    :param encoder: a function that takes an object and returns its serializable form.
+    """
+    _default_encoders.insert(0, (obj_type, encoder))
+    _encoders_by_type.clear()
 
 class MetaNamedDataclassSerializable(type):
 
@@ -223,3 +723,270 @@ class NamedDataclassSerializable(DataclassSerializable, metaclass=MetaNamedDatac
     @classmethod
     def serialize_fields(cls, obj): 
         return type(obj).__name__, super(NamedDataclassSerializable, cls).serialize_fields(obj)
+
+    @classmethod
+    def _passthrough_object(cls, obj):
+        return type(obj).__name__, obj
+
+    def read_object(self, stream):
+        _class_name, fields = orjson.loads(stream.read())
+        self.__dict__.update(typed_decoder.decode_fields(type(self), fields))
+
+    @classmethod
+    def from_serialized(cls, data):
+        """
+        Rebuild a typed object, including its nested objects, from its deserialized
+        `(class_name, fields)` form.
+
+        :param data: the deserialized form of an instance of a registered class.
+        :return: an instance of the registered class with the given class name.
+        """
+        return typed_decoder.decode(data, cls)
+
+
+class TypedDecoder(object):
+    """
+    Rebuilds typed objects from their deserialized form, as produced by `DataclassSerializable.asdict`
+    after it went through a codec.
+
+    Objects are constructed without calling their `__init__`, and their fields are set to the
+    deserialized values, so any transformations done in `__post_init__` are not repeated.
+    For each class, a constructor is generated once, which decodes each field according
+    to its annotation :
+
+      * fields annotated as primitives are used as they are
+      * fields annotated as a `DataclassSerializable` type are constructed from their dictionary
+      * lists, tuples, dictionaries and optionals are decoded item by item, converting the keys
+        of dictionaries annotated with int keys back to integers, and decoding the items of
+        tuples of fixed length each according to their own annotation
+      * fields that are not annotated precisely are decoded generically : lists of a registered
+        class name and a dictionary with the fields of that class are constructed as an instance
+        of that class.
+
+    When the deserialized fields do not match the fields of the class, missing fields get their
+    default value, and unknown keys are set as they are.
+    """
+
+    def __init__(self, cls_register):
+        self.cls_register = cls_register
+        self._constructors = dict()
+        self._field_names = dict()
+
+    def decode(self, data, annotation=typing.Any):
+        """
+        Decode a deserialized value according to its annotation.
+        """
+        decoder = self._value_decoder(annotation)
+        return data if decoder is None else decoder(data)
+
+    def decode_fields(self, cls, fields):
+        """
+        Decode the deserialized fields of a dataclass type into a dictionary of typed field values.
+        """
+        return self._constructor(cls)(fields).__dict__
+
+    def _decode_generic(self, data):
+        t = type(data)
+        if t is list:
+            if len(data) == 2 and type(data[0]) is str and type(data[1]) is dict:
+                cls = self.cls_register.get(data[0])
+                if cls is not None and _is_dataclass_type(cls) and self._has_fields(cls, data[1]):
+                    return self._constructor(cls)(data[1])
+            return [self._decode_generic(item) for item in data]
+        if t is dict:
+            return {key: self._decode_generic(value) for key, value in data.items()}
+        return data
+
+    def _has_fields(self, cls, fields):
+        field_names = self._field_names.get(cls)
+        if field_names is None:
+            field_names = self._field_names[cls] = frozenset(f.name for f in _dataclass_fields(cls))
+        return field_names == fields.keys()
+
+    def _decode_named(self, data):
+        if data is None:
+            return None
+        class_name, fields = data
+        cls = self.cls_register.get(class_name)
+        if cls is None:
+            raise TypeError('Class {} is not registered'.format(class_name))
+        return self._constructor(cls)(fields)
+
+    def _value_decoder(self, annotation):
+        """
+        :return: a function that decodes values with the given annotation,
+            or None if the values can be used as they are.
+        """
+        if _is_primitive_annotation(annotation):
+            return None
+        if annotation is typing.Any:
+            # as of Python 3.11, Any is a type
+            return self._decode_generic
+        if isinstance(annotation, type):
+            if issubclass(annotation, NamedDataclassSerializable):
+                return self._decode_named
+            if _is_dataclass_type(annotation):
+                constructor = self._constructor(annotation)
+                return lambda data: None if data is None else constructor(data)
+            if annotation in (list, tuple, dict):
+                return self._decode_generic
+            return None
+        origin = typing.get_origin(annotation)
+        args = [arg for arg in typing.get_args(annotation) if arg is not Ellipsis]
+        if origin is typing.Union:
+            non_null = [arg for arg in args if arg is not type(None)]
+            if len(non_null) == 1:
+                decoder = self._value_decoder(non_null[0])
+                if decoder is None:
+                    return None
+                return lambda data: None if data is None else decoder(data)
+        elif origin is list and len(args) == 1:
+            decoder = self._value_decoder(args[0])
+            if decoder is None:
+                return None
+            return lambda data: [decoder(item) for item in data]
+        elif origin is tuple and len(args) == 1:
+            decoder = self._value_decoder(args[0])
+            if decoder is None:
+                return lambda data: None if data is None else tuple(data)
+            return lambda data: None if data is None else tuple(decoder(item) for item in data)
+        elif origin is tuple:
+            # a tuple of fixed length, of which each item has its own annotation
+            decoders = [self._value_decoder(arg) for arg in args]
+            if not any(decoders):
+                return lambda data: None if data is None else tuple(data)
+            return lambda data: None if data is None else tuple(
+                item if decoder is None else decoder(item) for decoder, item in zip(decoders, data)
+            )
+        elif origin is dict and len(args) == 2:
+            decoder = self._value_decoder(args[1])
+            key_type = args[0] if args[0] in (int, float) else None
+            if key_type is None and decoder is None:
+                return None
+            decoder = decoder or (lambda value: value)
+            if key_type is None:
+                return lambda data: {key: decoder(value) for key, value in data.items()}
+            return lambda data: {key_type(key): decoder(value) for key, value in data.items()}
+        elif origin is typing.ClassVar or origin is typing.Literal:
+            return None
+        return self._decode_generic
+
+    def _constructor(self, cls):
+        """
+        Generate a function that constructs an instance of the dataclass type cls from the dictionary
+        of its deserialized fields.  The function is generated once per type, and cached.
+        """
+        constructor = self._constructors.get(cls)
+        if constructor is not None:
+            return constructor
+        try:
+            type_hints = typing.get_type_hints(cls)
+        except Exception:
+            # annotations that can not be evaluated are decoded generically
+            type_hints = {}
+        # Register a constructor that delegates to the generated one, to handle recursive types.
+        self._constructors[cls] = lambda fields: self._constructors[cls](fields)
+        field_decoders = []
+        items = []
+        for i, f in enumerate(_dataclass_fields(cls)):
+            decoder = self._value_decoder(type_hints.get(f.name, f.type))
+            field_decoders.append((f, decoder))
+            if decoder is None:
+                items.append('{0!r}: fields[{0!r}]'.format(f.name))
+            else:
+                items.append('{0!r}: decode_{1}(fields[{0!r}])'.format(f.name, i))
+        namespace = {
+            'new': object.__new__, 'cls': cls,
+            'field_names': frozenset(f.name for f, _decoder in field_decoders),
+            'construct_mismatched': functools.partial(self._construct_mismatched, cls, field_decoders),
+        }
+        for i, (_f, decoder) in enumerate(field_decoders):
+            namespace['decode_{}'.format(i)] = decoder
+        source = (
+            'def construct_{0}(fields):\n'
+            '    if fields.keys() != field_names:\n'
+            '        return construct_mismatched(fields)\n'
+            '    obj = new(cls)\n'
+            '    obj.__dict__.update({{{1}}})\n'
+            '    return obj\n'
+        ).format(cls.__name__, ', '.join(items))
+        exec(source, namespace)
+        constructor = self._constructors[cls] = namespace['construct_{}'.format(cls.__name__)]
+        return constructor
+
+    @staticmethod
+    def _construct_mismatched(cls, field_decoders, fields):
+        """
+        Construct an instance of the dataclass type cls from deserialized fields that do not
+        match the fields of the type, as sent by a peer with another version of the type.
+        Fields that are missing get their default value, and unknown keys are kept as they are.
+        """
+        obj = object.__new__(cls)
+        values = dict(fields)
+        for f, decoder in field_decoders:
+            if f.name in fields:
+                if decoder is not None:
+                    values[f.name] = decoder(fields[f.name])
+            elif f.default is not dataclasses.MISSING:
+                values[f.name] = f.default
+            elif f.default_factory is not dataclasses.MISSING:
+                values[f.name] = f.default_factory()
+        obj.__dict__.update(values)
+        return obj
+
+
+typed_decoder = TypedDecoder(MetaNamedDataclassSerializable.cls_register)
+
+
+class SerializationProfiler(object):
+    """
+    Collects statistics on the serialization of objects per class, to find out which objects
+    dominate the bandwidth and the serialization time between the model and the GUI.
+    For each class, it keeps the number of serialized objects, their total size in bytes,
+    and the total and maximum time spent serializing them in seconds.
+
+    The profiler is disabled by default, in which case the instrumented code only checks
+    the `enabled` flag.
+    """
+
+    def __init__(self):
+        self.enabled = False
+        self._stats = dict()
+
+    def record(self, key: str, size: int, duration: float) -> None:
+        """
+        Record the serialization of an object.
+
+        :param key: the name under which to aggregate the statistics, typically the class name.
+        :param size: the size of the serialized object in bytes.
+        :param duration: the time spent serializing the object in seconds.
+        """
+        stats = self._stats.get(key)
+        if stats is None:
+            stats = self._stats[key] = {'count': 0, 'bytes': 0, 'total_time': 0.0, 'max_time': 0.0}
+        stats['count'] += 1
+        stats['bytes'] += size
+        stats['total_time'] += duration
+        if duration > stats['max_time']:
+            stats['max_time'] = duration
+
+    def stats(self) -> typing.Dict[str, typing.Dict[str, typing.Any]]:
+        """
+        :return: a dictionary with the statistics of each class, ordered by decreasing total size.
+        """
+        return {
+            key: dict(stats) for key, stats in sorted(self._stats.items(), key=lambda item: -item[1]['bytes'])
+        }
+
+    def reset(self) -> None:
+        self._stats.clear()
+
+    def dump_json(self, path: str) -> None:
+        """
+        Write the statistics of each class to a JSON file.
+        """
+        with open(path, 'wb') as stream:
+            stream.write(orjson.dumps(self.stats(), option=orjson.OPT_INDENT_2))
+
+
+serialization_profiler = SerializationProfiler()
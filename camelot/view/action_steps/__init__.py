@@ -50,7 +50,8 @@ from .select_file import SelectFile, SelectDirectory, SaveFile, FileNameFilter
 from .select_object import SelectObjects, SelectObject
 from .update_progress import UpdateProgress, PushProgressLevel, PopProgressLevel, SetProgressAnimate
 from .crud import (
-    SetColumns, Completion, CompletionValue, Created, RowCount, Update, ChangeSelection
+    SetColumns, Completion, CompletionValue, Created, RowCount, Update, ChangeSelection,
+    ColumnarCreated, ColumnarUpdate
 )
 
 __all__ = [
@@ -63,6 +64,8 @@ __all__ = [
     SetSelection.__name__,
     CloseMenu.__name__,
     CloseView.__name__,
+    ColumnarCreated.__name__,
+    ColumnarUpdate.__name__,
     Completion.__name__,
     CompletionValue.__name__,
     Created.__name__,
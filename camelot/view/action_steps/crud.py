@@ -8,7 +8,7 @@ from camelot.admin.admin_route import Route
 from camelot.admin.action.base import ActionStep, State
 from camelot.admin.icon import CompletionValue
 from camelot.core.serializable import DataclassSerializable
-from camelot.view.crud_action import CrudActions, DataUpdate
+from camelot.view.crud_action import ColumnarDataUpdate, CrudActions, DataUpdate
 from camelot.view.utils import get_settings_group
 
 from dataclasses import dataclass, field, InitVar
@@ -135,6 +135,16 @@ class Update(ActionStep, DataUpdate):
 
     blocking: ClassVar[bool] = False
 
+@dataclass
+class ColumnarCreated(ActionStep, ColumnarDataUpdate):
+
+    blocking: ClassVar[bool] = False
+
+@dataclass
+class ColumnarUpdate(ActionStep, ColumnarDataUpdate):
+
+    blocking: ClassVar[bool] = False
+
 @dataclass
 class ChangeSelection(ActionStep, DataclassSerializable):
 
@@ -238,3 +238,4 @@ class RefreshItemView(ActionStep, DataclassSerializable):
 
     def __post_init__(self, model_context):
         model_context.item_cache = ValueCache(model_context.item_cache.max_entries)
+        model_context.read_ahead.clear()
@@ -81,8 +81,6 @@ class CreateUpdateDelete(ActionStep, DataclassSerializable):
             self.updated = leases.bind(str(next(self._lease_counter)), objects_updated)
         if len(objects_created):
             self.created = leases.bind(str(next(self._lease_counter)), objects_created)
-        if len(leases) > 10:
-            LOGGER.warn('Number of leases is growing to {}'.format(len(leases)))
 
 
 class FlushSession(CreateUpdateDelete):
@@ -15,6 +15,9 @@ from typing import Any, Dict, List, Optional
 @dataclass
 class DataCell(DataclassSerializable):
 
+    # the roles only contain values that are serialized by orjson or orjson_default
+    orjson_passthrough = True
+
     row: int = -1
     column: int = -1
     flags: int = Qt.ItemFlag.ItemIsEnabled | Qt.ItemFlag.ItemIsDropEnabled | Qt.ItemFlag.ItemIsDragEnabled | Qt.ItemFlag.ItemIsEditable | Qt.ItemFlag.ItemIsSelectable
@@ -33,6 +36,8 @@ class DataCell(DataclassSerializable):
 @dataclass
 class DataRowHeader(DataclassSerializable):
 
+    orjson_passthrough = True
+
     row: int = -1
     tool_tip: Optional[str] = None
     icon_name: Optional[str] = None
@@ -47,6 +52,8 @@ class DataRowHeader(DataclassSerializable):
 @dataclass
 class DataUpdate(DataclassSerializable):
 
+    orjson_passthrough = True
+
     changed_ranges: InitVar
 
     header_items: List[DataRowHeader] = field(default_factory=list)
@@ -58,6 +65,80 @@ class DataUpdate(DataclassSerializable):
             self.cells.extend(items)
 
 
+@dataclass
+class ColumnarDataUpdate(DataclassSerializable):
+    """
+    Columnar variant of `DataUpdate`, that holds the cells as one array per attribute
+    instead of a `DataCell` per cell, so the names of the attributes and the role keys
+    are not repeated for each cell.
+
+    The n-th cell is described by the n-th element of the rows, columns and flags arrays,
+    and by the n-th element of the array of each role.  When a role is not present in all
+    cells, the positions of the cells without it are listed in missing_roles, and the array
+    of the role holds None at those positions.
+
+    The `ColumnarUpdate` and `ColumnarCreated` action steps are built on top of it, to be
+    yielded instead of `Update` and `Created` by the producers of row data, once the client
+    handles them.  No producer yields them yet.
+    """
+
+    # the roles only contain values that are serialized by orjson or orjson_default
+    orjson_passthrough = True
+
+    changed_ranges: InitVar
+
+    header_items: List[DataRowHeader] = field(default_factory=list)
+    rows: List[int] = field(default_factory=list)
+    columns: List[int] = field(default_factory=list)
+    flags: List[int] = field(default_factory=list)
+    roles: Dict[int, List[Any]] = field(default_factory=dict)
+    missing_roles: Dict[int, List[int]] = field(default_factory=dict)
+
+    def __post_init__(self, changed_ranges):
+        for row, header_item, items in changed_ranges:
+            self.header_items.append(header_item)
+            for item in items:
+                self._append_cell(item)
+
+    def _append_cell(self, cell: DataCell):
+        position = len(self.rows)
+        self.rows.append(cell.row)
+        self.columns.append(cell.column)
+        self.flags.append(cell.flags)
+        for role, values in self.roles.items():
+            if role not in cell.roles:
+                values.append(None)
+                self.missing_roles.setdefault(role, []).append(position)
+        for role, value in cell.roles.items():
+            values = self.roles.get(role)
+            if values is None:
+                # the role is missing in all previous cells
+                values = self.roles[role] = [None] * position
+                if position:
+                    self.missing_roles[role] = list(range(position))
+            values.append(value)
+
+    @classmethod
+    def from_cells(cls, header_items: List[DataRowHeader], cells: List[DataCell]):
+        update = cls([])
+        update.header_items.extend(header_items)
+        for cell in cells:
+            update._append_cell(cell)
+        return update
+
+    def to_cells(self) -> List[DataCell]:
+        """
+        Construct the `DataCell` of each cell in this update.
+        """
+        cells = [DataCell(row, column, flags) for row, column, flags in zip(self.rows, self.columns, self.flags)]
+        for role, values in self.roles.items():
+            missing = set(self.missing_roles.get(role, ()))
+            for position, (cell, value) in enumerate(zip(cells, values)):
+                if position not in missing:
+                    cell.roles[role] = value
+        return cells
+
+
 invalid_item = DataCell()
 invalid_item.flags = Qt.ItemFlag.NoItemFlags
 invalid_item.roles[Qt.ItemDataRole.EditRole.value] = None
@@ -1,13 +1,15 @@
 from dataclasses import dataclass
-import orjson
 import logging
 import typing
 
 from ..core.exception import CancelRequest, GuiException
 from ..core.naming import (
-    CompositeName, NamingException, NameNotFoundException, initial_naming_context
+    CompactNamingContext, CompositeName, EntityNamingContext, NamingException,
+    NameNotFoundException, initial_naming_context
+)
+from ..core.serializable import (
+    NamedDataclassSerializable, Serializable, codecs, json_codec, serialization_profiler
 )
-from ..core.serializable import NamedDataclassSerializable, Serializable
 
 LOGGER = logging.getLogger('camelot.view.requests')
 
@@ -23,7 +25,8 @@ class ModelRun(object):
         self.last_step = None
         self.model_context = model_context
 
-model_run_names = initial_naming_context.bind_new_context('model_run')
+model_run_names = CompactNamingContext()
+initial_naming_context.bind_context('model_run', model_run_names)
 
 class AbstractRequest(NamedDataclassSerializable):
     """
@@ -31,8 +34,8 @@ class AbstractRequest(NamedDataclassSerializable):
     """
 
     @classmethod
-    def handle_request(cls, request, response_handler, cancel_handler):
-        request_type_name, request_data = orjson.loads(request)
+    def handle_request(cls, request, response_handler, cancel_handler, codec=json_codec):
+        request_type_name, request_data = codec.decode(request)
         request_type = NamedDataclassSerializable.get_cls_by_name(
             request_type_name
         )
@@ -91,7 +94,7 @@ class AbstractRequest(NamedDataclassSerializable):
         from ..admin.action import ActionStep
         from .responses import ActionStepped
         try:
-            run_name = tuple(request_data['run_name'])
+            run_name = initial_naming_context.get_validated_name(request_data['run_name'])
             run = initial_naming_context.resolve(run_name)
         except NameNotFoundException:
             LOGGER.error('Run name not found : {} for request {}'.format(run_name, request_data))
@@ -163,8 +166,8 @@ class InitiateAction(AbstractRequest):
             request_data['action_name'], request_data['mode'], request_data['model_context']
         ))
         try:
-            action = initial_naming_context.resolve(tuple(request_data['action_name']))
-            model_context = initial_naming_context.resolve(tuple(request_data['model_context']))
+            action = initial_naming_context.resolve(initial_naming_context.get_validated_name(request_data['action_name']))
+            model_context = initial_naming_context.resolve(initial_naming_context.get_validated_name(request_data['model_context']))
         except (NamingException, NameNotFoundException) as e:
             if isinstance(e, NamingException):
                 LOGGER.error('Could not resolve action from gui_run {}, invalid name: {}'.format(
@@ -212,9 +215,11 @@ class SendActionResponse(AbstractRequest):
 
     @classmethod
     def _next(cls, run, request_data):
-        response = run.last_step.deserialize_result(
-            run.model_context, request_data['response']
-        )
+        # resolve each entity name in the response only once
+        with EntityNamingContext.resolution_memo():
+            response = run.last_step.deserialize_result(
+                run.model_context, request_data['response']
+            )
         return run.generator.send(response)
 
 @dataclass
@@ -255,6 +260,70 @@ class StopProcess(AbstractRequest):
         raise SystemExit(0)
 
 
+@dataclass
+class GetNamingStatistics(AbstractRequest):
+    """
+    Request statistics on the bindings in the naming contexts of the model,
+    to which the model replies with a `NamingStatistics` response.
+    """
+
+    @classmethod
+    def execute(cls, request_data, response_handler, cancel_handler):
+        from .responses import NamingStatistics
+        response_handler.send_response(NamingStatistics(
+            stats=initial_naming_context.stats()
+        ))
+
+
+@dataclass
+class GetSerializationStatistics(AbstractRequest):
+    """
+    Request the statistics of the serialization profiler, to which the model replies
+    with a `SerializationStatistics` response.  The request can also enable or disable
+    the profiler, and reset its statistics after they have been reported.
+    """
+
+    enable: typing.Optional[bool] = None
+    reset: bool = False
+
+    @classmethod
+    def execute(cls, request_data, response_handler, cancel_handler):
+        from .responses import SerializationStatistics
+        if request_data.get('enable') is not None:
+            serialization_profiler.enabled = request_data['enable']
+        response_handler.send_response(SerializationStatistics(
+            enabled=serialization_profiler.enabled,
+            stats=serialization_profiler.stats(),
+        ))
+        if request_data.get('reset'):
+            serialization_profiler.reset()
+
+
+@dataclass
+class NegotiateCodec(AbstractRequest):
+    """
+    Request the model to switch the codec used on the connection, to which the model
+    replies with a `CodecNegotiated` response.  This response is still encoded with
+    the previous codec, all subsequent requests and responses use the negotiated codec.
+    When the requested codec is not available, or the response handler can not switch
+    codecs, the codec remains unchanged.
+    """
+
+    codec: str
+
+    @classmethod
+    def execute(cls, request_data, response_handler, cancel_handler):
+        from .responses import CodecNegotiated
+        codec = codecs.get(request_data['codec'])
+        set_codec = getattr(response_handler, 'set_codec', None)
+        if codec is None or set_codec is None:
+            LOGGER.warn('requested codec {} is not available'.format(request_data['codec']))
+            codec = getattr(response_handler, 'codec', json_codec)
+        response_handler.send_response(CodecNegotiated(codec=codec.name))
+        if set_codec is not None:
+            set_codec(codec)
+
+
 @dataclass
 class Unbind(AbstractRequest):
 
@@ -262,8 +331,19 @@ class Unbind(AbstractRequest):
 
     @classmethod
     def execute(cls, request_data, response_handler, cancel_handler):
+        # validate each name separately, so an invalid name does not prevent the others from being released
+        names, invalid = [], []
         for lease in request_data['names']:
             try:
-                initial_naming_context.unbind(tuple(lease))
-            except NameNotFoundException:
-                LOGGER.warn('received unbind request for non bound lease : {}'.format(lease))
+                names.append(initial_naming_context.get_validated_name(lease))
+            except NamingException:
+                invalid.append(lease)
+        if len(invalid):
+            LOGGER.warn('received unbind request for {} invalid names, first : {}'.format(len(invalid), invalid[0]))
+        results = initial_naming_context.unbind_many(names)
+        missing = [name for name, result in zip(names, results) if isinstance(result, NameNotFoundException)]
+        if len(missing):
+            LOGGER.warn('received unbind request for {} non bound leases, first : {}'.format(len(missing), missing[0]))
+        for result in results:
+            if result is not None and not isinstance(result, NameNotFoundException):
+                raise result
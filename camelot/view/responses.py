@@ -30,9 +30,40 @@ class ActionStepped(AbstractResponse):
     blocking: bool
     step: NamedDataclassSerializable
 
+    def _profiling_key(self):
+        # Account the steps of an action separately, as they make up most of the responses
+        return '{} {}'.format(type(self).__name__, self.step[0])
+
 
 @dataclass
 class ActionStopped(AbstractResponse):
     run_name: CompositeName
     gui_run_name: CompositeName
     exception: typing.Any
+
+
+@dataclass
+class NamingStatistics(AbstractResponse):
+    """
+    Statistics on the bindings in the naming contexts of the model,
+    as reported by :meth:`camelot.core.naming.NamingContext.stats`.
+    """
+    stats: typing.Dict[str, typing.Any]
+
+
+@dataclass
+class SerializationStatistics(AbstractResponse):
+    """
+    Statistics of the serialization profiler, per serialized class,
+    as reported by :meth:`camelot.core.serializable.SerializationProfiler.stats`.
+    """
+    enabled: bool
+    stats: typing.Dict[str, typing.Any]
+
+
+@dataclass
+class CodecNegotiated(AbstractResponse):
+    """
+    Confirms the codec used on the connection, in reply to a `NegotiateCodec` request.
+    """
+    codec: str
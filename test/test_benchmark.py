@@ -0,0 +1,343 @@
+"""
+Benchmarks of the optimized naming and serialization paths, each compared with
+the path it replaces.  The timings are logged at the info level, and each
+benchmark fails when the optimized path is clearly slower than the one it replaces.
+"""
+
+import dataclasses
+import datetime
+import enum
+import io
+import logging
+import timeit
+import unittest
+from decimal import Decimal
+from unittest import mock
+
+import orjson
+
+from camelot.core import utils
+from camelot.core.naming import Constant, ConstantNamingContext, NamingContext, ValidatedName, initial_naming_context
+from camelot.core.qt import QtCore, QtGui
+from camelot.core.serializable import (
+    DataclassSerializable, MetaNamedDataclassSerializable, NamedDataclassSerializable, _is_orjson_passthrough,
+    image_encoder, json_codec, json_encoder,
+)
+from camelot.core.utils import ugettext_lazy
+from camelot.view import forms
+from camelot.view.action_steps.crud import DataColumn, SetColumns, Update
+from camelot.view.crud_action import DataCell, DataRowHeader
+
+LOGGER = logging.getLogger(__name__)
+
+
+def measure(func, number, repeat=5):
+    """
+    :return: the best time of a single call to func, in seconds
+    """
+    return min(timeit.repeat(func, number=number, repeat=repeat)) / number
+
+
+class BenchmarkCase(unittest.TestCase):
+
+    # the optimized path may be this much slower before the benchmark fails,
+    # to absorb the noise of the measurements
+    tolerance = 1.2
+
+    def compare(self, label, reference, optimized, number):
+        reference_time = measure(reference, number)
+        optimized_time = measure(optimized, number)
+        LOGGER.info(
+            '{} : {:.2f}us before, {:.2f}us after, {:.1f}x'.format(
+                label, reference_time * 1e6, optimized_time * 1e6, reference_time / optimized_time
+            )
+        )
+        self.assertLess(optimized_time, reference_time * self.tolerance)
+        return reference_time, optimized_time
+
+
+class PathIndexBenchmark(BenchmarkCase):
+
+    def setUp(self):
+        context = initial_naming_context.bind_new_context('benchmark')
+        self.addCleanup(initial_naming_context.unbind_context, 'benchmark')
+        for part in ('X', '3', 'list', 'actions'):
+            context = context.bind_new_context(part)
+        context.bind('foo', object())
+        self.name = ('benchmark', 'X', '3', 'list', 'actions', 'foo')
+
+    def test_deep_resolve(self):
+        name = self.name
+        self.assertIs(
+            initial_naming_context.resolve(name), NamingContext.resolve(initial_naming_context, name)
+        )
+        self.compare(
+            'resolve of a route of depth {}'.format(len(name)),
+            lambda: NamingContext.resolve(initial_naming_context, name),
+            lambda: initial_naming_context.resolve(name),
+            2000,
+        )
+
+
+def bind_constant(obj):
+    """
+    The isinstance chain that named constant objects before the dispatch on their type
+    """
+    if obj is None:
+        return ValidatedName(('constant', 'null'))
+    if isinstance(obj, bool):
+        return ValidatedName(('constant', 'true' if obj else 'false'))
+    for constant_type in Constant:
+        if isinstance(obj, constant_type.composite_type):
+            base_name = ('constant', constant_type.name)
+            if isinstance(obj, Constant.time.composite_type):
+                return ValidatedName((*base_name, *[str(atomic_name) for atomic_name in [obj.year, obj.month, obj.day, obj.hour, obj.minute, obj.second]]))
+            if isinstance(obj, Constant.date.composite_type):
+                return ValidatedName((*base_name, *[str(atomic_name) for atomic_name in [obj.year, obj.month, obj.day]]))
+            if isinstance(obj, Constant.decimal.composite_type):
+                return ValidatedName((*base_name, str(obj.normalize())))
+            return ValidatedName((*base_name, str(obj)))
+
+
+class ConstantBenchmark(BenchmarkCase):
+
+    def setUp(self):
+        # the cells of a table of 100 rows, with the mix of types of a typical financial table,
+        # in which dates and amounts are repeated across rows
+        self.values = []
+        for row in range(100):
+            self.values.extend([
+                row, 'name {}'.format(row), None, row % 2 == 0,
+                Decimal('{}.50'.format(row % 10)), datetime.date(2020, 1 + row % 12, 1),
+                datetime.datetime(2020, 1, 1, 12, row % 60, 0),
+            ])
+        self.names = [initial_naming_context._bind_object(value) for value in self.values]
+
+    def test_bind(self):
+        values = self.values
+        self.assertEqual([bind_constant(value) for value in values], self.names)
+        self.compare(
+            'naming of {} constants'.format(len(values)),
+            lambda: [bind_constant(value) for value in values],
+            lambda: [initial_naming_context._bind_object(value) for value in values],
+            50,
+        )
+
+    def test_resolve(self):
+        contexts = {
+            constant.name: initial_naming_context.resolve_context(('constant', constant.name)) for constant in Constant
+        }
+        names = [name for name in self.names if name[1] in contexts]
+        self.assertEqual(
+            [ConstantNamingContext._decode(contexts[name[1]], name[2:]) for name in names],
+            [initial_naming_context.resolve(name) for name in names],
+        )
+        self.compare(
+            'decoding of {} constants'.format(len(names)),
+            lambda: [ConstantNamingContext._decode(contexts[name[1]], name[2:]) for name in names],
+            lambda: [contexts[name[1]]._decode(name[2:]) for name in names],
+            50,
+        )
+
+
+def asdict_loop(obj):
+    """
+    The serialization of dataclasses before the generated serializers, that loops
+    over the fields of each dataclass and passes each value through the recursion
+    """
+    t = type(obj)
+    if dataclasses.is_dataclass(t):
+        result = []
+        for f in dataclasses.fields(t):
+            result.append((f.name, asdict_loop(getattr(obj, f.name))))
+        return dict(result)
+    if t is dict:
+        return {k: asdict_loop(v) for k, v in obj.items()}
+    if t is list:
+        return [asdict_loop(v) for v in obj]
+    if t is tuple:
+        return tuple(asdict_loop(v) for v in obj)
+    return obj
+
+
+def update_step(rows, columns):
+    return Update([
+        (row, DataRowHeader(row=row, tool_tip='tip', verbose_identifier='row {}'.format(row)), [
+            DataCell(row, column, 1, {0: 'value {}'.format(column), 2: column, 8: None}) for column in range(columns)
+        ]) for row in range(rows)
+    ])
+
+
+class SerializerBenchmark(BenchmarkCase):
+
+    def test_update(self):
+        update = update_step(500, 10)
+        self.assertEqual(json_codec.encode(asdict_loop(update)), json_codec.encode(update.asdict(update)))
+        self.compare(
+            'serialization of an Update of 500 rows',
+            lambda: asdict_loop(update),
+            lambda: update.asdict(update),
+            5,
+        )
+
+
+def stream_buffer(obj):
+    """
+    The serialization of responses before `to_buffer`, that wrote the bytes of the
+    object to an in memory stream, and copied them out of it
+    """
+    stream = io.BytesIO()
+    if _is_orjson_passthrough(type(obj)):
+        stream.write(json_codec.encode(obj._passthrough_object(obj)))
+    else:
+        stream.write(json_codec.encode(obj.asdict(obj)))
+    return stream.getvalue()
+
+
+class Admin(object):
+
+    def get_columns(self):
+        return []
+
+
+class BufferBenchmark(BenchmarkCase):
+
+    def assert_throughput(self, label, obj, number):
+        data = obj.to_buffer()
+        self.assertEqual(stream_buffer(obj), data)
+        reference_time, optimized_time = self.compare(label, lambda: stream_buffer(obj), obj.to_buffer, number)
+        LOGGER.info('{} : {:.0f}MB/s before, {:.0f}MB/s after'.format(
+            label, len(data) / reference_time / 1e6, len(data) / optimized_time / 1e6
+        ))
+
+    def test_update(self):
+        self.assert_throughput('serialization of an Update of 2000 rows', update_step(2000, 10), 5)
+
+    def test_set_columns(self):
+        step = SetColumns(Admin(), [])
+        step.columns.extend(
+            DataColumn(
+                'field_{}'.format(i), 'Field {}'.format(i), True, 100, 'PlainTextDelegate',
+                {'action_routes': [], 'column_span': 1, 'tooltip': 'tip {}'.format(i)}, i % 2 == 0
+            ) for i in range(200)
+        )
+        self.assert_throughput('serialization of SetColumns of 200 columns', step, 50)
+
+
+def decode_reflective(data):
+    """
+    A decoder without generated constructors, that looks up the fields of each
+    object while decoding it, and sets them one by one
+    """
+    t = type(data)
+    if t is list:
+        if len(data) == 2 and type(data[0]) is str and type(data[1]) is dict:
+            cls = MetaNamedDataclassSerializable.get_cls_by_name(data[0])
+            if cls is not None:
+                obj = object.__new__(cls)
+                for f in dataclasses.fields(cls):
+                    setattr(obj, f.name, decode_reflective(data[1][f.name]))
+                return obj
+        return [decode_reflective(item) for item in data]
+    if t is dict:
+        return {key: decode_reflective(value) for key, value in data.items()}
+    return data
+
+
+def form_layout(tab_count):
+    """
+    A layout of the size of the form of an admin of a large entity
+    """
+    tabs = []
+    for tab in range(tab_count):
+        fields = ['field_{}_{}'.format(tab, i) for i in range(12)]
+        tabs.append(('Tab {}'.format(tab), [
+            forms.GroupBoxForm('Group {}'.format(tab), forms.Form(fields[:4], columns=2)),
+            forms.HBoxForm([fields[4:6], forms.VBoxForm([fields[6:8], [forms.Label('Note'), fields[8]]])]),
+            forms.GridForm([[fields[9], fields[10]], [forms.ColumnSpan(fields[11], 2)]]),
+            forms.WidgetOnlyForm('items_{}'.format(tab)),
+            forms.Stretch(),
+        ]))
+    return forms.TabForm(tabs)
+
+
+class TypedDecoderBenchmark(BenchmarkCase):
+
+    def test_form(self):
+        form = form_layout(6)
+        data = json_codec.decode(form.to_buffer())
+        decoded = NamedDataclassSerializable.from_serialized(data)
+        self.assertEqual(decoded.to_buffer(), form.to_buffer())
+        self.assertEqual(decode_reflective(data), decoded)
+        self.compare(
+            'decoding of a TabForm of {} kB'.format(len(form.to_buffer()) // 1000),
+            lambda: decode_reflective(data),
+            lambda: NamedDataclassSerializable.from_serialized(data),
+            200,
+        )
+
+
+def default_isinstance(obj):
+    """
+    The isinstance chain that converted the objects orjson does not serialize natively,
+    before the dispatch on their type
+    """
+    if isinstance(obj, ugettext_lazy):
+        return str(obj)
+    if isinstance(obj, QtGui.QKeySequence):
+        return obj.toString()
+    if isinstance(obj, enum.Enum):
+        return obj.value
+    if isinstance(obj, QtCore.QJsonValue):
+        return obj.toVariant()
+    if isinstance(obj, QtGui.QImage):
+        return image_encoder.encode(obj)
+    if isinstance(obj, DataclassSerializable):
+        return obj.asdict(obj)
+    if isinstance(obj, (datetime.date, datetime.datetime)):
+        raise TypeError("{} {} can not be serialized.".format(type(obj), obj))
+    if isinstance(obj, ValidatedName):
+        return tuple(obj)
+    if isinstance(obj, list):
+        return [default_isinstance(v) for v in obj]
+    if isinstance(obj, str):
+        return str(obj)
+    raise TypeError
+
+
+class Status(str, enum.Enum):
+
+    draft = 'draft'
+    complete = 'complete'
+
+
+class Name(str):
+    pass
+
+
+class DefaultEncoderBenchmark(BenchmarkCase):
+
+    def test_payload(self):
+        # the fields of a form of 2000 fields, with translated labels, statuses and routes,
+        # enums are serialized by orjson natively, and do not reach the default function
+        payload = [
+            {
+                'name': Name('field_{}'.format(i)), 'verbose_name': ugettext_lazy('Field {}'.format(i)),
+                'tooltip': ugettext_lazy('Tooltip'), 'status': Status.draft if i % 2 else Status.complete,
+                'route': ValidatedName(('admin', 'Person', str(i))),
+            } for i in range(2000)
+        ]
+        # the labels are translated by the translations in memory, to measure the dispatch rather than Qt
+        translations = {'Field {}'.format(i): 'Veld {}'.format(i) for i in range(2000)}
+        translations['Tooltip'] = 'Tip'
+        patcher = mock.patch.dict(utils._translations_, translations)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        option = orjson.OPT_NON_STR_KEYS | orjson.OPT_PASSTHROUGH_SUBCLASS
+        self.assertEqual(orjson.dumps(payload, default=default_isinstance, option=option), json_encoder.encode(payload))
+        self.compare(
+            'conversion of {} objects'.format(len(payload) * 4),
+            lambda: orjson.dumps(payload, default=default_isinstance, option=option),
+            lambda: json_encoder.encode(payload),
+            10,
+        )
@@ -0,0 +1,123 @@
+import random
+import unittest
+
+from camelot.core.cache import ColumnarValueCache, ValueCache
+
+
+class ValueCacheCase(unittest.TestCase):
+
+    def test_lru_eviction(self):
+        cache = ValueCache(3)
+        for row, entity in enumerate('abc'):
+            cache.add_data(row, entity, {'x': row})
+        # requesting the data of a row uses it
+        self.assertEqual(cache.get_data(0), {'x': 0})
+        cache.add_data(3, 'd', {'x': 3})
+        self.assertEqual(list(cache.rows_by_entity), ['c', 'a', 'd'])
+        # adding data to a row uses it as well
+        cache.add_data(2, 'c', {'x': 2})
+        cache.add_data(4, 'e', {'x': 4})
+        self.assertEqual(list(cache.rows_by_entity), ['d', 'c', 'e'])
+        self.assertEqual(cache.metrics['evictions'], 2)
+
+    def test_evicted_rows(self):
+        cache = ValueCache(2, max_size=1000, size_of=len)
+        cache.add_data(0, 'a', {'x': 1, 'y': 2})
+        cache.add_data(1, 'b', {'x': 1})
+        cache.add_data(2, 'c', {'x': 1})
+        # all data of the evicted entity is removed
+        self.assertEqual(cache.get_data(0), {})
+        self.assertNotIn(0, cache.data_by_rows)
+        self.assertNotIn(0, cache.entities_by_row)
+        self.assertNotIn(0, cache.sizes_by_row)
+        self.assertEqual(cache.delete_by_entity('a'), (None, None))
+        self.assertEqual(cache.size, 2)
+        # when the entity is added again, all its columns changed
+        self.assertEqual(cache.add_data(0, 'a', {'x': 1, 'y': 2}), {'x', 'y'})
+
+    def test_max_size(self):
+        cache = ValueCache(10, max_size=5, size_of=len)
+        cache.add_data(0, 'a', {'x': 1, 'y': 2})
+        cache.add_data(1, 'b', {'x': 1, 'y': 2})
+        self.assertEqual(cache.size, 4)
+        # updating a row accounts for the size of all its values
+        cache.add_data(1, 'b', {'z': 3})
+        self.assertEqual(cache.size, 5)
+        # moving an entity to another row keeps its size
+        cache.add_data(2, 'a', {'x': 1})
+        self.assertEqual(cache.size, 5)
+        self.assertEqual(cache.sizes_by_row, {1: 3, 2: 2})
+        cache.add_data(3, 'c', {'x': 1})
+        self.assertEqual(list(cache.rows_by_entity), ['a', 'c'])
+        self.assertEqual(cache.size, 3)
+        self.assertEqual(cache.delete_by_entity('a'), (2, {'x': 1, 'y': 2}))
+        self.assertEqual(cache.size, 1)
+        # a single row larger than max_size is kept
+        cache.add_data(4, 'd', {column: 0 for column in 'abcdefgh'})
+        self.assertEqual(list(cache.rows_by_entity), ['d'])
+        self.assertEqual(cache.size, 8)
+
+    def test_metrics(self):
+        cache = ValueCache(10)
+        self.assertEqual(cache.hit_ratio, 0.0)
+        self.assertEqual(cache.changed_column_ratio, 0.0)
+        self.assertEqual(cache.add_data(0, 'a', {'x': 1, 'y': 2}), {'x', 'y'})
+        self.assertEqual(cache.add_data(0, 'a', {'x': 1, 'y': 3}), {'y'})
+        cache.get_data(0)
+        cache.get_data(0)
+        cache.get_data(1)
+        cache.get_data(2)
+        self.assertEqual(cache.metrics, {'hits': 2, 'misses': 2, 'evictions': 0, 'columns': 4, 'changed_columns': 3})
+        self.assertEqual(cache.hit_ratio, 0.5)
+        self.assertEqual(cache.changed_column_ratio, 0.75)
+
+
+class ColumnarValueCacheCase(unittest.TestCase):
+
+    def add_rows(self, cache, first_row, entities, columns):
+        return [
+            cache.add_data(first_row + i, entity, {column: values[i] for column, values in columns.items()})
+            for i, entity in enumerate(entities)
+        ]
+
+    def assert_same(self, value_cache, columnar_cache):
+        self.assertEqual(dict(value_cache.entities_by_row), dict(columnar_cache.entities_by_row))
+        self.assertEqual(list(value_cache.rows_by_entity), list(columnar_cache.rows_by_entity))
+        for row in value_cache.rows():
+            self.assertEqual(value_cache.get_data(row), columnar_cache.get_data(row))
+
+    def test_eviction_within_block(self):
+        value_cache, columnar_cache = ValueCache(3), ColumnarValueCache(3, page_size=4)
+        for cache in (value_cache, columnar_cache):
+            self.add_rows(cache, 0, ['a', 'b', 'c'], {'x': [1, 2, 3]})
+        # when 'd' and 'e' are added, 'a' and 'b' are evicted before their turn,
+        # so all their columns changed, although their values are the same
+        columns = {'x': [4, 5, 1, 2]}
+        changed = self.add_rows(value_cache, 3, ['d', 'e', 'a', 'b'], columns)
+        self.assertEqual(changed, [{'x'}, {'x'}, {'x'}, {'x'}])
+        self.assertEqual(columnar_cache.add_block(3, ['d', 'e', 'a', 'b'], columns), changed)
+        self.assertEqual(columnar_cache.metrics['evictions'], value_cache.metrics['evictions'])
+        self.assert_same(value_cache, columnar_cache)
+
+    def test_block_larger_than_cache(self):
+        value_cache, columnar_cache = ValueCache(2), ColumnarValueCache(2, page_size=4)
+        columns = {'x': [1, None, 3, 4, 5], 'y': [True, False, None, True, True]}
+        changed = self.add_rows(value_cache, 0, list('abcde'), columns)
+        self.assertEqual(columnar_cache.add_block(0, list('abcde'), columns), changed)
+        self.assert_same(value_cache, columnar_cache)
+
+    def test_random_blocks(self):
+        rnd = random.Random(0)
+        for _i in range(200):
+            max_entries = rnd.randint(1, 10)
+            value_cache, columnar_cache = ValueCache(max_entries), ColumnarValueCache(max_entries, page_size=4)
+            for _j in range(6):
+                first_row = rnd.randint(0, 12)
+                entities = rnd.sample(range(16), rnd.randint(1, 10))
+                columns = {
+                    column: [rnd.choice([None, 1, 2, 'a']) for _entity in entities]
+                    for column in rnd.sample(['x', 'y', 'z'], rnd.randint(1, 3))
+                }
+                changed = self.add_rows(value_cache, first_row, entities, columns)
+                self.assertEqual(columnar_cache.add_block(first_row, entities, columns), changed)
+                self.assert_same(value_cache, columnar_cache)
@@ -0,0 +1,102 @@
+import unittest
+from unittest import mock
+
+from camelot.admin.model_context import ObjectsModelContext
+from camelot.core.item_model.proxy import AbstractModelProxy
+
+
+class ListProxy(AbstractModelProxy):
+
+    def __init__(self, objects):
+        self.objects = objects
+        self.fetches = 0
+
+    def __len__(self):
+        return len(self.objects)
+
+    def copy(self):
+        return ListProxy(list(self.objects))
+
+    def sort(self, key=None, reverse=False):
+        self.objects.sort(reverse=reverse)
+
+    def filter(self, key, value):
+        raise NotImplementedError()
+
+    def get_filter(self, key):
+        return None
+
+    def get_model(self):
+        return self.objects
+
+    def append(self, obj):
+        self.objects.append(obj)
+
+    def remove(self, obj):
+        self.objects.remove(obj)
+
+    def index(self, obj):
+        return self.objects.index(obj)
+
+    def __getitem__(self, sl, yield_per=None):
+        self.fetches += 1
+        return iter(self.objects[sl])
+
+
+class ReadAheadCase(unittest.TestCase):
+
+    def setUp(self):
+        self.proxy = ListProxy(['obj{:03d}'.format(i) for i in range(100)])
+        self.model_context = ObjectsModelContext(None, self.proxy, None)
+        self.model_context.collection_count = len(self.proxy)
+
+    def get_rows(self, first_row, last_row):
+        return list(self.model_context.get_rows(first_row, last_row))
+
+    def assert_rows(self, first_row, last_row):
+        self.assertEqual(
+            self.get_rows(first_row, last_row),
+            [(row, self.proxy.objects[row]) for row in range(first_row, last_row + 1)]
+        )
+
+    def test_prefetch(self):
+        self.assert_rows(0, 9)
+        self.assert_rows(5, 14)
+        self.assertEqual(self.proxy.fetches, 1)
+        self.assertEqual(self.model_context.read_ahead.metrics['prefetched_rows'], 10)
+
+    def test_sort(self):
+        self.assert_rows(10, 19)
+        self.proxy.sort(reverse=True)
+        # a sort keeps the length of the proxy, the prefetched objects are dropped explicitly
+        self.model_context.read_ahead.clear()
+        self.assert_rows(12, 17)
+        self.assertEqual(self.proxy.fetches, 2)
+
+    def test_no_lookups(self):
+        self.assert_rows(10, 19)
+        # serving the prefetched objects does not look them up in the proxy
+        with mock.patch.object(self.proxy, 'index', side_effect=AssertionError):
+            self.assert_rows(12, 17)
+        self.assertEqual(self.proxy.fetches, 1)
+
+    def test_remove(self):
+        self.assert_rows(10, 19)
+        self.proxy.remove(self.proxy.objects[15])
+        self.model_context.collection_count = len(self.proxy)
+        self.assert_rows(10, 19)
+        self.assertEqual(self.proxy.fetches, 2)
+
+    def test_append(self):
+        self.assert_rows(0, 9)
+        # an object inserted inside the window shifts the objects after it
+        self.proxy.objects.insert(5, 'new')
+        self.assert_rows(0, 9)
+        self.assertEqual(self.proxy.fetches, 2)
+        self.assertEqual(self.model_context.read_ahead.metrics['invalidations'], 1)
+
+    def test_new_proxy(self):
+        self.assert_rows(0, 9)
+        self.proxy = self.model_context.proxy = self.proxy.copy()
+        self.assert_rows(0, 9)
+        self.assertEqual(self.proxy.fetches, 1)
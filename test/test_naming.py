@@ -0,0 +1,453 @@
+import datetime
+import random
+import sys
+import threading
+import tracemalloc
+import unittest
+from unittest import mock
+
+from camelot.core import naming
+from camelot.core.naming import (
+    BindingStorage, BindingType, CompactBindingStorage, CompactNamingContext, EntityNamingContext, ExpiringBindingStorage,
+    ImmutableBindingException, NameNotFoundException, NamingContext, NamingException, ReclaimableNamingContext,
+    ReferenceCountingBindingStorage, ValidatedName, WeakValueBindingStorage,
+    initial_naming_context,
+)
+from camelot.view.requests import Unbind
+
+
+class Bound(object):
+    pass
+
+
+class CompactBindingStorageCase(unittest.TestCase):
+
+    def setUp(self):
+        self.now = 1000.0
+        patcher = mock.patch.object(naming.time, 'monotonic', lambda: self.now)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.storage = CompactBindingStorage(BindingType.named_object)
+
+    def test_immutable(self):
+        self.storage.add('a', 1, immutable=True)
+        with self.assertRaises(ImmutableBindingException):
+            self.storage.add('a', 2)
+        with self.assertRaises(ImmutableBindingException):
+            self.storage.remove('a')
+        self.assertEqual(self.storage.get('a'), 1)
+
+    def test_oldest_timestamp(self):
+        self.assertIsNone(self.storage.oldest_timestamp())
+        self.storage.add('a', 1)
+        self.storage.add('b', 1)
+        self.now = 1005.0
+        self.storage.add('c', 1)
+        self.storage.add('d', 1)
+        self.now = 1010.0
+        self.storage.add('e', 1)
+        self.assertEqual(self.storage.oldest_timestamp(), 1000)
+        self.storage.remove('a')
+        self.assertEqual(self.storage.oldest_timestamp(), 1000)
+        self.storage.remove('b')
+        self.assertEqual(self.storage.oldest_timestamp(), 1005)
+        # the mark of the oldest binding is removed, an older age is reported
+        self.storage.remove('c')
+        self.assertEqual(self.storage.oldest_timestamp(), 1005)
+        self.storage.remove('d')
+        self.assertEqual(self.storage.oldest_timestamp(), 1010)
+        # rebinding keeps the age of the binding
+        self.now = 1020.0
+        self.storage.add('e', 2)
+        self.assertEqual(self.storage.oldest_timestamp(), 1010)
+        self.assertEqual(self.storage.copy().oldest_timestamp(), 1010)
+
+    def test_max_marks(self):
+        for i in range(2 * self.storage.max_marks):
+            self.now = 1000.0 + i
+            self.storage.add(str(i), i)
+        self.assertEqual(len(self.storage._marks), self.storage.max_marks)
+        self.assertEqual(self.storage.oldest_timestamp(), 1000)
+
+    def test_names(self):
+        for name in ('0', '12', '012', '-1', 'a1', '٣'):
+            self.storage.add(name, name)
+        self.assertEqual([name for (name,) in self.storage.list()], ['0', '12', '012', '-1', 'a1', '٣'])
+        for name in ('0', '12', '012', '-1', 'a1', '٣'):
+            self.assertIn(name, self.storage)
+            self.assertEqual(self.storage.get(name), name)
+        self.assertNotIn('00', self.storage)
+        self.storage.remove('12')
+        self.assertEqual(self.storage.get('012'), '012')
+        self.assertEqual(len(self.storage.copy()), 5)
+
+    def test_memory(self):
+        # Bytes per binding, keyed by names like those of the model_run context,
+        # which are created when the object is bound, and no longer referenced by the caller afterwards.
+        obj = Bound()
+        first_id = id(obj)
+
+        def measure(storage_type, count):
+            storage = storage_type(BindingType.named_object)
+            tracemalloc.start()
+            try:
+                for i in range(count):
+                    storage.add(str(first_id + 16 * i), obj)
+                return tracemalloc.get_traced_memory()[0] / count
+            finally:
+                tracemalloc.stop()
+
+        # tracing the allocations is slow, 200k bindings are enough to measure the size of a binding
+        compact_size = measure(CompactBindingStorage, 200000)
+        # the marks of the seconds in which bindings were added only add a few bytes in total,
+        # while the ints of the names take half the memory of their strings
+        self.assertLess(compact_size, measure(BindingStorage, 200000) - 16)
+        self.assertLess(compact_size, measure(WeakValueBindingStorage, 200000))
+
+
+class ReferenceCountingCase(unittest.TestCase):
+
+    def setUp(self):
+        self.context = ReclaimableNamingContext()
+        initial_naming_context.bind_context('reclaimable', self.context)
+        self.addCleanup(initial_naming_context.unbind_context, 'reclaimable')
+
+    def test_storage(self):
+        storage = ReferenceCountingBindingStorage(BindingType.named_object)
+        obj = Bound()
+        storage.add('1', obj)
+        storage.add('1', obj)
+        self.assertIs(storage.remove('1'), obj)
+        self.assertIs(storage.get('1'), obj)
+        self.assertEqual(storage.metrics['reclaimed'], 0)
+        self.assertIs(storage.remove('1'), obj)
+        self.assertNotIn('1', storage)
+        self.assertEqual(storage.metrics['reclaimed'], 1)
+        with self.assertRaises(NameNotFoundException):
+            storage.remove('1')
+        # the copy keeps the counts
+        storage.add('2', obj)
+        storage.add('2', obj)
+        duplicate = storage.copy()
+        duplicate.remove('2')
+        self.assertIn('2', duplicate)
+        self.assertIn('2', storage)
+
+    def test_bind_twice(self):
+        obj = Bound()
+        names = [self.context.rebind('1', obj) for _i in range(2)]
+        self.assertEqual(names[0], names[1])
+        self.assertEqual(self.context.metrics, {'live': 1})
+        initial_naming_context.unbind(names[0])
+        # the second copy of the name remains valid
+        self.assertIs(initial_naming_context.resolve(names[1]), obj)
+        self.assertEqual(self.context.metrics['reclaimed'], 0)
+        initial_naming_context.unbind(names[1])
+        with self.assertRaises(NameNotFoundException):
+            initial_naming_context.resolve(names[1])
+        self.assertEqual(self.context.metrics, {'live': 0, 'reclaimed': 1})
+        with self.assertRaises(NameNotFoundException):
+            initial_naming_context.unbind(names[1])
+
+    def test_bind_object(self):
+        obj = Bound()
+        with self.assertLogs(naming.LOGGER, 'WARNING'):
+            names = [initial_naming_context._bind_object(obj) for _i in range(2)]
+        self.assertEqual(names[0][0], 'object')
+        object_context = initial_naming_context.resolve_context('object')
+        reclaimed = object_context.metrics['reclaimed']
+        for name in names:
+            self.assertIs(initial_naming_context.resolve(name), obj)
+            initial_naming_context.unbind(name)
+        self.assertNotIn(names[0], initial_naming_context)
+        self.assertEqual(object_context.metrics['reclaimed'], reclaimed + 1)
+
+class ExpiringBindingStorageCase(unittest.TestCase):
+
+    def setUp(self):
+        self.now = 1000.0
+        patcher = mock.patch.object(naming.time, 'monotonic', lambda: self.now)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.storage = ExpiringBindingStorage(BindingType.named_object, time_to_live=600, max_size=3)
+
+    def test_expiry(self):
+        self.storage.add('a', 1)
+        self.now += 300
+        self.storage.add('b', 2)
+        self.now += 300
+        self.assertNotIn('a', self.storage)
+        self.assertEqual(self.storage.get('b'), 2)
+        with self.assertRaises(NameNotFoundException):
+            self.storage.get('a')
+        self.assertEqual(self.storage.metrics['expired'], 1)
+        self.assertEqual(self.storage.oldest_timestamp(), 1300.0)
+
+    def test_renew(self):
+        self.storage.add('a', 1)
+        self.storage.add('b', 2, immutable=True)
+        self.now += 500
+        self.storage.renew('a')
+        self.now += 500
+        self.assertEqual(self.storage.get('a'), 1)
+        # immutable bindings are renewed instead of expiring
+        self.assertEqual(self.storage.get('b'), 2)
+        self.assertEqual(self.storage.metrics['renewed'], 1)
+        self.assertEqual(self.storage.metrics['expired'], 0)
+        with self.assertRaises(NameNotFoundException):
+            self.storage.renew('c')
+
+    def test_max_size(self):
+        for name in 'abc':
+            self.storage.add(name, name)
+            self.now += 1
+        self.storage.renew('a')
+        with self.assertLogs(naming.LOGGER, 'WARNING') as logs:
+            self.storage.add('d', 'd')
+        self.assertIn('evicted 1 bindings', logs.output[0])
+        self.assertEqual([name for (name,) in self.storage.list()], ['c', 'a', 'd'])
+        self.assertEqual(self.storage.metrics['evicted'], 1)
+
+    def test_max_size_immutable(self):
+        for name in 'abc':
+            self.storage.add(name, name, immutable=True)
+        # the binding being added is never evicted, even when only immutable bindings remain
+        with self.assertNoLogs(naming.LOGGER, 'WARNING'):
+            self.storage.add('d', 'd')
+        self.assertEqual(len(self.storage), 4)
+        with self.assertLogs(naming.LOGGER, 'WARNING'):
+            self.storage.add('e', 'e')
+        self.assertEqual(sorted(name for (name,) in self.storage.list()), ['a', 'b', 'c', 'e'])
+
+
+class ValidatedNameCase(unittest.TestCase):
+
+    def test_unhashable_name(self):
+        with self.assertRaises(NamingException):
+            initial_naming_context.get_validated_name(['leases', ['1']])
+
+    def test_endpoint_name(self):
+        name = initial_naming_context.get_validated_name(['constant', 'date', '2020', '1', '31'])
+        self.assertIsInstance(name, ValidatedName)
+        self.assertEqual(initial_naming_context.resolve(name), datetime.date(2020, 1, 31))
+        # all parts handled by the endpoint context are validated, not only the first one
+        for invalid_name in (['constant', 'date', '2020', 'x', '1'], ['constant', 'date', '2020', '1', 'x']):
+            with self.assertRaises(NamingException):
+                initial_naming_context.get_validated_name(invalid_name)
+
+    def test_unbind_invalid_name(self):
+        leases = [initial_naming_context.bind(('leases', 'unbind_{}'.format(i)), i) for i in range(2)]
+        with self.assertLogs('camelot.view.requests', 'WARNING'):
+            Unbind.execute({'names': [list(leases[0]), ['leases', ['1']], list(leases[1])]}, None, None)
+        for lease in leases:
+            self.assertNotIn(lease, initial_naming_context)
+
+
+class ConcurrencyCase(unittest.TestCase):
+
+    def setUp(self):
+        switch_interval = sys.getswitchinterval()
+        # switch threads as often as possible, to interleave the naming operations
+        sys.setswitchinterval(1e-6)
+        self.addCleanup(sys.setswitchinterval, switch_interval)
+        self.context = NamingContext()
+        self.compact_context = CompactNamingContext()
+        initial_naming_context.bind_context('concurrency', self.context)
+        self.addCleanup(initial_naming_context.unbind_context, 'concurrency')
+        self.context.bind_context('compact', self.compact_context)
+        self.context_names = [('concurrency',), ('concurrency', 'compact'), ('leases',)]
+
+    def hammer(self, worker_id, errors):
+        rng = random.Random(worker_id)
+        try:
+            for i in range(5000):
+                name = (*rng.choice(self.context_names), str(rng.randrange(5)))
+                operation = rng.random()
+                try:
+                    if operation < 0.4:
+                        initial_naming_context.rebind(name, (worker_id, i))
+                    elif operation < 0.7:
+                        initial_naming_context.resolve(name)
+                    elif operation < 0.8:
+                        initial_naming_context.unbind(name)
+                    elif operation < 0.85:
+                        initial_naming_context.stats()
+                    elif operation < 0.9:
+                        list(initial_naming_context.iter_names(prefix=name[:-1]))
+                    else:
+                        initial_naming_context.resolve_many([name, name])
+                except NamingException:
+                    pass
+        except Exception as e:
+            errors.append(e)
+
+    def test_bind_resolve_unbind(self):
+        errors = []
+        workers = [threading.Thread(target=self.hammer, args=(worker_id, errors)) for worker_id in range(16)]
+        for worker in workers:
+            worker.start()
+        for worker in workers:
+            worker.join()
+        self.assertEqual(errors, [])
+        # the path index should contain exactly the bindings of the contexts
+        index = initial_naming_context._index[BindingType.named_object]
+        for context in (self.context, self.compact_context):
+            names = [(*context._name, *name) for name in context._bindings[BindingType.named_object].list()]
+            for name in names:
+                self.assertIs(index[name], context.resolve(name[-1]))
+            indexed = [name for name in index if name[:-1] == context._name]
+            self.assertEqual(len(indexed), len(names))
+
+
+class ListPageCase(unittest.TestCase):
+
+    def setUp(self):
+        self.context = NamingContext()
+        initial_naming_context.bind_context('list_page', self.context)
+        self.addCleanup(initial_naming_context.unbind_context, 'list_page')
+        for i in range(10):
+            self.context.bind(str(i), i)
+            subcontext = self.context.bind_new_context(str(i))
+            for j in range(i):
+                subcontext.bind(str(j), j)
+
+    def list_all(self, page_size, binding_type=None):
+        names, cursor = [], None
+        while True:
+            page, cursor = self.context.list_page(binding_type=binding_type, cursor=cursor, page_size=page_size)
+            names.extend(page)
+            if cursor is None:
+                return names
+
+    def test_pages(self):
+        names = list(self.context.iter_names())
+        self.assertEqual(len(names), 20 + 45)
+        for page_size in (1, 3, 7, 100):
+            self.assertEqual(self.list_all(page_size), names)
+        objects = [item for item in names if item[1] == BindingType.named_object]
+        self.assertEqual(self.list_all(4, BindingType.named_object), objects)
+
+    def test_changes_between_pages(self):
+        page, cursor = self.context.list_page(page_size=10)
+        self.context.unbind(cursor[0])
+        self.context.bind('99', 99)
+        rest, _cursor = self.context.list_page(cursor=cursor, page_size=1000)
+        self.assertEqual(rest, [
+            item for item in self.context.iter_names() if (item[0], item[1].value) > (cursor[0], cursor[1].value)
+        ])
+        self.assertIn((('99',), BindingType.named_object), rest)
+
+    def test_cursor_outside_prefix(self):
+        for cursor in ((('2', '1'), BindingType.named_object), (('3',), BindingType.named_context)):
+            with self.assertRaises(NamingException) as exception:
+                list(self.context.iter_names(prefix='3', cursor=cursor))
+            self.assertEqual(exception.exception.reason, NamingException.Message.invalid_cursor)
+        names = list(self.context.iter_names(prefix='3', cursor=(('3', '0'), BindingType.named_object)))
+        self.assertEqual(names, [(('3', '1'), BindingType.named_object), (('3', '2'), BindingType.named_object)])
+
+
+class Person(object):
+
+    def __init__(self, id):
+        self.id = id
+
+
+class Session(object):
+    """A session on a table of persons, with an identity map and a log of the queries"""
+
+    def __init__(self, ids):
+        self.rows = {id: Person(id) for id in ids}
+        self.identity_map = dict()
+        self.queries = []
+
+    def query(self, entity):
+        return Query(self)
+
+
+class Query(object):
+
+    def __init__(self, session):
+        self.session = session
+
+    def filter(self, primary_keys):
+        self.session.queries.append(sorted(primary_keys))
+        return [self.session.rows[id] for id in sorted(primary_keys) if id in self.session.rows]
+
+    def get(self, primary_key):
+        self.session.queries.append([int(primary_key[0])])
+        return self.session.rows.get(int(primary_key[0]))
+
+
+class EntityNamingContextCase(unittest.TestCase):
+
+    def setUp(self):
+        self.session = Session(range(1, 11))
+        # primary keys of instances are not always returned as integers
+        mapper = mock.Mock(
+            primary_key=[mock.Mock(in_=lambda values: set(values))],
+            identity_key_from_primary_key=lambda primary_key: (Person, tuple(primary_key)),
+            primary_key_from_instance=lambda instance: [str(instance.id)],
+        )
+        orm = mock.Mock(class_mapper=lambda entity: mapper)
+        orm.session._sessions = {1: self.session}
+        state = mock.Mock(expired=False, deleted=False, was_deleted=False)
+        for patcher in (
+            mock.patch.object(naming, 'orm', orm),
+            mock.patch.object(naming, 'inspect', lambda instance: state),
+            mock.patch('vfinance.model.entity.EntityBase', Person),
+        ):
+            patcher.start()
+            self.addCleanup(patcher.stop)
+        self.context = EntityNamingContext(Person)
+        initial_naming_context.bind_context(('entity', 'person'), self.context)
+        self.addCleanup(initial_naming_context.unbind_context, ('entity', 'person'))
+
+    def test_resolve_many_chunks(self):
+        self.context.query_chunk_size = 4
+        names = [('1', str(id)) for id in (3, 1, 2, 10, 5, 4, 12, 1)]
+        results = self.context.resolve_many(names)
+        self.assertEqual([result.id for result in results if isinstance(result, Person)], [3, 1, 2, 10, 5, 4, 1])
+        self.assertIsInstance(results[6], NameNotFoundException)
+        self.assertEqual(len(self.session.queries), 2)
+        self.assertEqual(sorted(sum(self.session.queries, [])), [1, 2, 3, 4, 5, 10, 12])
+        self.assertEqual(self.context.resolution_counters['queries'], 2)
+
+    def test_identity_map(self):
+        for id in (2, 3):
+            self.session.identity_map[(Person, (id,))] = self.session.rows[id]
+        results = self.context.resolve_many([('1', '2'), ('1', '3'), ('1', '4')])
+        self.assertEqual([result.id for result in results], [2, 3, 4])
+        self.assertEqual(self.session.queries, [[4]])
+        self.assertEqual(self.context.resolution_counters['identity_map_hits'], 2)
+        self.assertEqual(self.context.resolution_counters['identity_map_misses'], 1)
+        self.assertIs(self.context.resolve(('1', '2')), self.session.rows[2])
+        self.assertEqual(len(self.session.queries), 1)
+
+    def test_resolution_memo(self):
+        with EntityNamingContext.resolution_memo():
+            first = self.context.resolve(('1', '5'))
+            self.assertIs(self.context.resolve(('1', '5')), first)
+            results = self.context.resolve_many([('1', '5'), ('1', '6'), ('1', '6')])
+            self.assertIs(results[0], first)
+            self.assertIs(results[1], results[2])
+            self.assertIs(self.context.resolve(('1', '6')), results[1])
+        self.assertEqual(self.session.queries, [[5], [6]])
+        self.assertEqual(self.context.resolution_counters['memo_hits'], 3)
+        # outside the block, names are resolved again
+        self.context.resolve(('1', '5'))
+        self.assertEqual(len(self.session.queries), 3)
+        self.assertEqual(self.context.resolution_counters['memo_hits'], 3)
+
+    def test_resolution_memo_expired(self):
+        with EntityNamingContext.resolution_memo():
+            self.context.resolve(('1', '5'))
+            with mock.patch.object(naming, 'inspect', lambda instance: mock.Mock(expired=True)):
+                self.context.resolve(('1', '5'))
+        self.assertEqual(self.session.queries, [[5], [5]])
+        self.assertEqual(self.context.resolution_counters['memo_hits'], 0)
+
+    def test_counters_per_context(self):
+        self.context.resolve(('1', '5'))
+        other_context = EntityNamingContext(Person)
+        self.assertEqual(other_context.resolution_counters['queries'], 0)
+        self.assertEqual(self.context.resolution_counters['queries'], 1)
@@ -0,0 +1,393 @@
+import dataclasses
+import datetime
+import io
+import typing
+import unittest
+import uuid
+from unittest import mock
+
+import orjson
+
+from camelot.admin.icon import Icon
+from camelot.core import utils
+from camelot.core.naming import ValidatedName
+from camelot.core.qt import QtGui
+from camelot.core.serializable import (
+    BinaryCodec, DataclassSerializable, ImageEncoder, NamedDataclassSerializable, _default_encoders, _encoders_by_type,
+    _is_orjson_passthrough, json_codec, orjson_default, register_default_encoder, serialization_profiler, typed_decoder,
+)
+from camelot.core.utils import ugettext_lazy
+from camelot.view import forms
+from camelot.view.action_steps.crud import Update
+from camelot.view.crud_action import ColumnarDataUpdate, DataCell, DataRowHeader, DataUpdate
+from camelot.view.requests import NegotiateCodec
+from camelot.view.responses import ActionStepped
+
+
+@dataclasses.dataclass
+class Point(DataclassSerializable):
+
+    x: int
+    y: str
+
+
+@dataclasses.dataclass
+class OptedInPoint(DataclassSerializable):
+
+    orjson_passthrough = True
+
+    x: int
+    y: str
+
+
+@dataclasses.dataclass
+class OptedInLine(DataclassSerializable):
+
+    orjson_passthrough = True
+
+    points: typing.List[Point]
+
+
+class OrjsonPassthroughCase(unittest.TestCase):
+
+    def assert_equivalent(self, obj):
+        self.assertEqual(obj.to_buffer(), json_codec.encode(obj.asdict(obj)))
+
+    def test_opt_in(self):
+        self.assertFalse(_is_orjson_passthrough(Point))
+        self.assertTrue(_is_orjson_passthrough(OptedInPoint))
+        # nested dataclasses that did not opt in are serialized by orjson differently
+        self.assertFalse(_is_orjson_passthrough(OptedInLine))
+        for t in (DataCell, DataRowHeader, DataUpdate, Update, ColumnarDataUpdate, Icon):
+            self.assertTrue(_is_orjson_passthrough(t), t)
+
+    def test_extra_attribute(self):
+        point = Point(1, 'a')
+        point.extra = 5
+        self.assertEqual(point.to_buffer(), b'{"x":1,"y":"a"}')
+        self.assert_equivalent(point)
+
+    def test_data_cell(self):
+        self.assert_equivalent(DataCell(0, 1, 1, {0: 'a', 2: None, 3: [1.5, True]}))
+        self.assert_equivalent(DataCell(2, 3, 1, {0: 'a', 7: {'b': 'c'}}))
+
+    def test_columnar_data_update(self):
+        header = DataRowHeader(row=0, tool_tip='tip', decoration=Icon('cog'))
+        changed_ranges = [
+            (0, header, [DataCell(0, 0, 1, {0: 'a', 1: 2}), DataCell(0, 1, 1, {1: 3})]),
+            (1, DataRowHeader(row=1), [DataCell(1, 0, 1, {0: 'b', 5: None})]),
+        ]
+        self.assert_equivalent(ColumnarDataUpdate(changed_ranges))
+        self.assert_equivalent(ColumnarDataUpdate([]))
+
+    def test_action_stepped(self):
+        step = Update([
+            (0, DataRowHeader(row=0, decoration=Icon('cog')), [DataCell(0, 0, 1, {0: 'a', 2: None})]),
+            (1, DataRowHeader(row=1), [DataCell(1, 0, 1, {0: 'b'}), DataCell(1, 1, 1, {})]),
+        ])
+        response = ActionStepped(('run',), ('gui_run',), False, (type(step).__name__, step))
+        # the step is left to orjson, instead of being converted to a dictionary
+        self.assertIs(response.asdict(response)[1]['step'][1], step)
+        expected = orjson.dumps(['ActionStepped', {
+            'run_name': ['run'], 'gui_run_name': ['gui_run'], 'blocking': False,
+            'step': ['Update', dataclasses.asdict(step)],
+        }], option=orjson.OPT_NON_STR_KEYS)
+        self.assertEqual(response.to_buffer(), expected)
+        # codecs that do not serialize dataclasses convert the step through orjson_default
+        decoded = BinaryCodec().decode(response.to_buffer(BinaryCodec()))
+        self.assertEqual(decoded[1]['step'][1]['header_items'][1]['row'], 1)
+        self.assertEqual(len(decoded[1]['step'][1]['cells']), 3)
+
+
+@dataclasses.dataclass
+class Shape(DataclassSerializable):
+
+    name: str
+    points: typing.List[Point] = dataclasses.field(default_factory=list)
+    closed: bool = False
+
+
+class TypedDecoderCase(unittest.TestCase):
+
+    def test_round_trip(self):
+        shape = Shape('line', [Point(1, 'a'), Point(2, 'b')], True)
+        decoded = typed_decoder.decode(orjson.loads(shape.to_buffer()), Shape)
+        self.assertEqual(decoded, shape)
+        self.assertIsInstance(decoded.points[0], Point)
+
+    def test_missing_fields(self):
+        decoded = typed_decoder.decode({'name': 'dot'}, Shape)
+        self.assertEqual(decoded, Shape('dot'))
+        # default factories are called for each object
+        self.assertIsNot(decoded.points, typed_decoder.decode({'name': 'dot'}, Shape).points)
+
+    def test_unknown_fields(self):
+        decoded = typed_decoder.decode({'name': 'dot', 'points': [{'x': 1, 'y': 'a'}], 'color': 'red'}, Shape)
+        self.assertEqual(decoded, Shape('dot', [Point(1, 'a')]))
+        self.assertEqual(decoded.color, 'red')
+
+    def test_fixed_length_tuple(self):
+        annotation = typing.Tuple[Point, int, typing.Optional[Point]]
+        data = orjson.loads(json_codec.encode((Point(1, 'a'), 2, None)))
+        self.assertEqual(typed_decoder.decode(data, annotation), (Point(1, 'a'), 2, None))
+        self.assertEqual(typed_decoder.decode([1, 'a'], typing.Tuple[int, str]), (1, 'a'))
+        self.assertIsNone(typed_decoder.decode(None, typing.Tuple[int, str]))
+        decoded = typed_decoder.decode([['a', {'x': 1, 'y': 'b'}]], typing.List[typing.Tuple[str, Point]])
+        self.assertEqual(decoded, [('a', Point(1, 'b'))])
+
+    def test_any(self):
+        # the content of a group box is annotated as Any
+        form = forms.GroupBoxForm('Group', forms.Form(['a', 'b'], columns=2))
+        decoded = NamedDataclassSerializable.from_serialized(orjson.loads(form.to_buffer()))
+        self.assertIsInstance(decoded.content[0], forms.Form)
+        self.assertEqual(decoded.to_buffer(), form.to_buffer())
+
+    def test_read_object(self):
+        shape = Shape('line')
+        shape.read_object(io.BytesIO(b'{"name":"dot","points":[{"x":1,"y":"a"}]}'))
+        self.assertEqual(shape, Shape('dot', [Point(1, 'a')]))
+
+
+class ColumnarDataUpdateCase(unittest.TestCase):
+
+    def setUp(self):
+        self.header_items = [DataRowHeader(row=0), DataRowHeader(row=1)]
+        self.cells = [
+            DataCell(0, 0, 1, {0: 'a', 1: 2}),
+            # a role present with a None value is not a missing role
+            DataCell(0, 1, 3, {0: None}),
+            DataCell(1, 0, 1, {}),
+            DataCell(1, 1, 1, {1: 5, 7: [1, 2]}),
+        ]
+
+    def test_round_trip(self):
+        update = ColumnarDataUpdate.from_cells(self.header_items, self.cells)
+        self.assertEqual(update.to_cells(), self.cells)
+        self.assertEqual(update.header_items, self.header_items)
+        self.assertEqual(update.rows, [0, 0, 1, 1])
+        self.assertEqual(update.roles[0], ['a', None, None, None])
+        self.assertEqual(update.missing_roles, {0: [2, 3], 1: [1, 2], 7: [0, 1, 2]})
+
+    def test_empty(self):
+        update = ColumnarDataUpdate.from_cells([], [])
+        self.assertEqual(update.to_cells(), [])
+        self.assertEqual(update.roles, {})
+
+    def test_changed_ranges(self):
+        changed_ranges = [
+            (0, self.header_items[0], self.cells[:2]),
+            (1, self.header_items[1], self.cells[2:]),
+        ]
+        update = DataUpdate(changed_ranges)
+        columnar_update = ColumnarDataUpdate(changed_ranges)
+        self.assertEqual(columnar_update.to_cells(), update.cells)
+        self.assertEqual(columnar_update.header_items, update.header_items)
+
+
+class ImageEncoderCase(unittest.TestCase):
+
+    def setUp(self):
+        self.encoder = ImageEncoder()
+        self.image = QtGui.QImage(4, 4, QtGui.QImage.Format.Format_RGB32)
+        self.image.fill(0)
+
+    def test_cache(self):
+        data = self.encoder.encode(self.image)
+        self.assertIsInstance(data, str)
+        self.assertEqual(self.encoder.encode(self.image), data)
+        self.assertEqual(self.encoder.metrics['hits'], 1)
+        # modifying the image changes its cache key
+        self.image.fill(1)
+        self.assertNotEqual(self.encoder.encode(self.image), data)
+        self.assertEqual(self.encoder.metrics['misses'], 2)
+
+    def test_max_size(self):
+        other_image = QtGui.QImage(4, 4, QtGui.QImage.Format.Format_RGB32)
+        other_image.fill(1)
+        # both images fit in the cache, but not together
+        max_size = len(ImageEncoder().encode(self.image)) + len(ImageEncoder().encode(other_image)) - 1
+        self.encoder.configure(max_size=max_size)
+        self.encoder.encode(self.image)
+        self.encoder.encode(other_image)
+        self.assertEqual(self.encoder.metrics['evicted'], 1)
+        self.assertEqual(len(self.encoder), 1)
+        self.encoder.encode(self.image)
+        self.assertEqual(self.encoder.metrics['hits'], 0)
+
+    def test_too_large(self):
+        data = self.encoder.encode(self.image)
+        self.encoder.configure(max_size=len(data) - 1)
+        # images larger than the cache are encoded, but not cached
+        self.assertEqual(self.encoder.encode(self.image), data)
+        self.assertEqual(self.encoder.encode(self.image), data)
+        self.assertEqual(len(self.encoder), 0)
+        self.assertEqual(self.encoder.metrics['hits'], 0)
+        self.assertEqual(self.encoder.metrics['evicted'], 0)
+
+    def test_by_reference(self):
+        self.encoder.configure(by_reference=True)
+        first = self.encoder.encode(self.image)
+        self.assertEqual(set(first.keys()), {'ref', 'data'})
+        self.assertEqual(self.encoder.encode(self.image), {'ref': first['ref']})
+
+
+class SerializationProfilerCase(unittest.TestCase):
+
+    def setUp(self):
+        serialization_profiler.reset()
+        serialization_profiler.enabled = True
+        self.addCleanup(setattr, serialization_profiler, 'enabled', False)
+        self.addCleanup(serialization_profiler.reset)
+
+    def test_record_once(self):
+        response = ActionStepped(('run',), ('gui_run',), False, ('Point', Point(1, 'a')))
+        data = response.to_buffer()
+        stats = serialization_profiler.stats()
+        self.assertEqual(list(stats.keys()), ['ActionStepped Point'])
+        self.assertEqual(stats['ActionStepped Point']['count'], 1)
+        self.assertEqual(stats['ActionStepped Point']['bytes'], len(data))
+
+
+class Temperature(object):
+
+    def __init__(self, degrees):
+        self.degrees = degrees
+
+
+class Kelvin(Temperature):
+    pass
+
+
+class Code(str):
+    pass
+
+
+class DefaultEncoderCase(unittest.TestCase):
+
+    def setUp(self):
+        translations = mock.patch.dict(utils._translations_, {'Name': 'Naam'})
+        translations.start()
+        self.addCleanup(translations.stop)
+        registered = list(_default_encoders)
+
+        def restore():
+            _default_encoders[:] = registered
+            _encoders_by_type.clear()
+
+        self.addCleanup(restore)
+
+    def test_subclasses(self):
+        class Translation(ugettext_lazy):
+            pass
+
+        self.assertEqual(orjson_default(Translation('Name')), 'Naam')
+        self.assertEqual(orjson_default(Code('a')), 'a')
+        self.assertIs(type(orjson_default(Code('a'))), str)
+        self.assertEqual(orjson_default(ValidatedName(('a', 'b'))), ('a', 'b'))
+        self.assertEqual(orjson_default([Code('a'), ugettext_lazy('Name')]), ['a', 'Naam'])
+        self.assertEqual(json_codec.encode({'name': ugettext_lazy('Name'), 'code': Code('a')}), b'{"name":"Naam","code":"a"}')
+        with self.assertRaises(TypeError):
+            orjson_default(Temperature(5))
+
+    def test_register(self):
+        with self.assertRaises(TypeError):
+            orjson_default(Kelvin(5))
+        register_default_encoder(Temperature, lambda obj: obj.degrees)
+        # the cache of the encoders by type is invalidated
+        self.assertEqual(orjson_default(Kelvin(5)), 5)
+        self.assertEqual(json_codec.encode([Temperature(3)]), b'[3]')
+        # later registrations take precedence over earlier ones, also for subclasses of built-in types
+        register_default_encoder(Kelvin, lambda obj: obj.degrees - 273)
+        register_default_encoder(Code, str.upper)
+        self.assertEqual(orjson_default(Kelvin(300)), 27)
+        self.assertEqual(orjson_default(Temperature(300)), 300)
+        self.assertEqual(orjson_default(Code('a')), 'A')
+
+
+class ResponseHandler(object):
+
+    def __init__(self):
+        self.responses = []
+
+    def send_response(self, response):
+        self.responses.append(response)
+
+
+class BinaryCodecCase(unittest.TestCase):
+
+    def setUp(self):
+        self.codec = BinaryCodec()
+
+    def assert_round_trip(self, obj):
+        self.assertEqual(self.codec.decode(self.codec.encode(obj)), obj)
+
+    def test_primitives(self):
+        for obj in (None, True, False, 0, 1, 127, 128, -1, -128, 2**70, -2**70, 0.0, -1.5, 1e300, '', 'a', 'é€😀'):
+            self.assert_round_trip(obj)
+        self.assertIs(self.codec.decode(self.codec.encode(True)), True)
+        self.assertIs(self.codec.decode(self.codec.encode(0)), 0)
+
+    def test_containers(self):
+        self.assert_round_trip([])
+        self.assert_round_trip({})
+        self.assert_round_trip({'a': [1, 'a', {'a': None}], 'b': [-3.5, 'b' * 100, 'b' * 100], 'c': {}})
+        # keys are converted to strings, as with JSON
+        self.assertEqual(
+            self.codec.decode(self.codec.encode({2: 'a', -1: 'b', None: 'c', True: 'd', 1.5: 'e'})),
+            {'2': 'a', '-1': 'b', 'null': 'c', 'true': 'd', '1.5': 'e'},
+        )
+        # tuples are sent as arrays, as with JSON
+        self.assertEqual(self.codec.decode(self.codec.encode(('a', 1))), ['a', 1])
+
+    def assert_same_as_json(self, obj):
+        self.assertEqual(self.codec.decode(obj.to_buffer(self.codec)), json_codec.decode(obj.to_buffer(json_codec)))
+
+    def test_same_as_json(self):
+        roles = {
+            0: 'a', 1: 5, 2: None, 3: datetime.date(2020, 1, 31), 4: datetime.datetime(2020, 1, 31, 12, 30, 5),
+            5: uuid.UUID(int=1), 6: Point(1, 'a'), 7: float('nan'), 8: [1.5, True], 9: {10: 'b'},
+        }
+        cells = [DataCell(0, 0, 1, roles), DataCell(0, 1, 3, {0: 'c'})]
+        self.assert_same_as_json(cells[0])
+        header = DataRowHeader(row=0, tool_tip='tip', decoration=Icon('cog'))
+        self.assert_same_as_json(Update([(0, header, cells)]))
+        self.assert_same_as_json(ColumnarDataUpdate([(0, header, cells)]))
+        response = ActionStepped(('run',), ('gui_run',), False, ('Update', Update([(0, header, cells)])))
+        self.assert_same_as_json(response)
+
+    def test_invalid(self):
+        with self.assertRaises(ValueError):
+            self.codec.decode(self.codec.encode(1) + b'\x00')
+        with self.assertRaises(ValueError):
+            self.codec.decode(b'\x09')
+
+    def test_size(self):
+        self.assertEqual(len(self.codec.encode(5)), 1)
+        self.assertEqual(len(self.codec.encode(['name', 'name', 'name'])), 12)
+        changed_ranges = [
+            (row, DataRowHeader(row=row), [DataCell(row, column, 1, {0: 'value', 1: column}) for column in range(10)])
+            for row in range(100)
+        ]
+        update = ColumnarDataUpdate(changed_ranges)
+        binary = update.to_buffer(self.codec)
+        self.assertLess(len(binary), len(update.to_buffer(json_codec)) / 2)
+        self.assertEqual(self.codec.decode(binary)['rows'], update.rows)
+
+    def test_metrics(self):
+        data = self.codec.encode([1, 2])
+        self.codec.decode(data)
+        self.assertEqual(self.codec.metrics['encoded'], 1)
+        self.assertEqual(self.codec.metrics['decoded_bytes'], len(data))
+        # the time is only measured while profiling
+        self.assertNotIn('encode_time', self.codec.metrics)
+        serialization_profiler.enabled = True
+        try:
+            self.codec.decode(data)
+        finally:
+            serialization_profiler.enabled = False
+        self.assertIn('decode_time', self.codec.metrics)
+
+    def test_negotiate_without_codec(self):
+        response_handler = ResponseHandler()
+        NegotiateCodec.execute({'codec': 'binary'}, response_handler, None)
+        self.assertEqual(response_handler.responses[0].codec, 'json')